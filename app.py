@@ -1,62 +1,115 @@
-from shiny import App, ui, reactive, render
-import pickle
-from chart_plotting import (
-    grade_race_gender_charts,
-    sp_eng_fre_charts,
-    race_grade_charts,
-    absence_gender_charts,
-    absence_grade_charts,
-    heatmap_plot,
-    notification_plot,
-    notification_plot2,
-    notification_plot3,
-    notif_grade_plot,
-    notif_grade_plot2,
-    notif_grade_plot3,
-    grade_3yr_charts,
-)
+from shiny import App, ui, reactive, render, req
+from chart_plotting import page_count, page_labels, render_png
+from interactive_charts import chart_spec
+from caching import LRUCache
 from utils import (
     reports,
     question_titles,
     districts,
-    get_subsets,
-    style_table,
+    display_frame,
     style_dataframe,
+    table_html,
+    period_note,
+)
+from datastore import (
+    DataStore,
+    DatastoreWatcher,
+    SharedFrames,
+    datastore_from_env,
+    month_registry,
+    open_datastore,
 )
+from prerender import artifact_path, chart_filename
+from auth import LoginLimiter, client_address, load_users
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import os
-import bcrypt
-from github import Github
+import asyncio
+import math
+import hashlib
+import tempfile
 import pandas as pd
-import urllib.request
 
 ##### to deploy on shinyapps.io ###### (anaconda prompt worked)
 # rsconnect deploy shiny "C:\Users\joliphant\OneDrive - El Dorado County Office of Education\Documents\shinyPractice\01-basic-app"
 # --name edcoe-fiscal-data --title attendanceworks2425
 
 
-# all_data.pickle should contain a multilevel dict
-# with the top level keys being the names of districts ('black_oak_mine_unified', etc),
-# and the assiociated values being a dictionary with keys
-# for each report type ('bygrade', etc)
-# the values of this dictionary will be pandas dataframes.
+# each snapshot is either a pickle of a multilevel dict, or a directory with
+# one parquet file per frame (see snapshot.py, which converts the former into
+# the latter). Either way the top level keys are the names of districts
+# ('black_oak_mine_unified', etc), the second level keys are the report types
+# ('bygrade', etc) and the values are pandas dataframes.
+# frames are only downloaded when a session first asks for them.
 
 path_to_file = os.path.dirname(__file__)
 load_dotenv(os.path.join(path_to_file, ".env"))
 
-ghub = Github(os.getenv('github_token'))
-repo = ghub.get_repo('joliphant-edcoe/attendanceWorksDatastore')
-contents = repo.get_contents('data')
-private_urls = [c.download_url for c in contents]
-# print(private_urls)
+# see datastore_from_env for where the data comes from. DATASTORE_OFFLINE=1
+# starts from the last cached listing without contacting the source.
+source, cache = datastore_from_env(os.path.join(path_to_file, ".datastore_cache"))
+snapshots = open_datastore(
+    source, cache, offline=os.getenv("DATASTORE_OFFLINE") == "1"
+)
+
+# new or updated months are picked up in the background every
+# DATASTORE_POLL_SECONDS (0 turns this off), without restarting the app
+poll_seconds = int(os.getenv("DATASTORE_POLL_SECONDS", "900"))
+
+# months are labelled and ordered from each snapshot's metadata
+# (see snapshot.py), most recent first
+# frames are memory-mapped from the cache directory so that all the worker
+# processes on this machine share one copy. A retired snapshot's frames are
+# kept for two polls, until every worker has reloaded.
+store = DataStore(
+    month_registry(snapshots),
+    shared=SharedFrames(
+        os.path.join(cache.cache_dir, "frames"), grace=2 * poll_seconds
+    ),
+)
+
+# rendered charts and tables are shared by every session. Keys start with the
+# version of the snapshot they were drawn from, and entries for snapshots that
+# a reload retired are dropped.
+chart_cache = LRUCache(int(os.getenv("CHART_CACHE_MB", "64")) * 2**20)
+table_cache = LRUCache(int(os.getenv("TABLE_CACHE_MB", "32")) * 2**20)
+# formatted frames for dataframe mode; treat them as read-only
+display_cache = LRUCache(
+    int(os.getenv("TABLE_CACHE_MB", "32")) * 2**20,
+    sizeof=lambda df: int(df.memory_usage(deep=True).sum()),
+)
+# vega-lite specs (as json) for the interactive chart mode
+spec_cache = LRUCache(int(os.getenv("TABLE_CACHE_MB", "32")) * 2**20)
+for c in [chart_cache, table_cache, display_cache, spec_cache]:
+    store.on_replace(
+        lambda versions, c=c: c.discard(lambda key: key[0] not in versions)
+    )
+
+if poll_seconds > 0:
+    DatastoreWatcher(store, source, cache, poll_seconds).start()
 
-with urllib.request.urlopen(private_urls[0]) as f:
-    oct = pickle.load(f)
+# who can log in and which districts they see; AUTH_USERS_FILE can point at a
+# json file (see auth.load_users), otherwise the SECRET_KEY_* variables are used
+users = load_users(os.getenv("AUTH_USERS_FILE"))
 
-with urllib.request.urlopen(private_urls[1]) as f:
-    sep = pickle.load(f)
+# logins are rate limited per session and per client ip, and an (ip, user)
+# pair is locked out for longer and longer after repeated wrong keys. the ip
+# limit is generous since a whole district may share one address. wrong keys
+# are also limited per username, which holds however many addresses a guesser
+# rotates through; right keys never wait on it, since a district shares one
+# username and anyone could keep it empty.
+# TRUSTED_PROXIES is the number of reverse proxies in front of the app, whose
+# X-Forwarded-For entries are believed (see auth.client_address).
+login_limiter = LoginLimiter(
+    {"session": (1 / 5, 5), "ip": (2, 30), "user": (1 / 10, 10)}
+)
+trusted_proxies = int(os.getenv("TRUSTED_PROXIES", "0"))
+# at most half the cores ever run bcrypt, however many people log in at once
+bcrypt_pool = ThreadPoolExecutor(max(1, (os.cpu_count() or 2) // 2))
 
-all_data = {"October": oct, "September": sep}
+# charts and tables built ahead of time by prerender.py are served straight
+# from disk when they exist
+prerender_dir = os.getenv("PRERENDER_DIR", os.path.join(path_to_file, "prerendered"))
 
 # UI
 app_ui = ui.page_fluid(
@@ -66,29 +119,14 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "username",
                 "Choose your user",
-                choices=[
-                    "COUNTY",
-                    "BOM",
-                    "CAMINO",
-                    "EDHS",
-                    "GOAK",
-                    "GTRAIL",
-                    "LAKETAHOE",
-                    "LATROBE",
-                    "MOTHER",
-                    "PIONEER",
-                    "PLACERV",
-                    "POLLOCK",
-                    "RESCUE",
-                    "SPED",
-                    "CHARTER",
-                ],
+                choices=users.usernames(),
                 multiple=False,
             ),
             ui.input_password(
                 "secret_key",
                 "Enter your District's secret key to access:",
             ),
+            ui.input_action_button("login", "Log in"),
             ui.input_select(
                 "districts",
                 "Select District to Display",
@@ -115,10 +153,11 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "date_range",
                 "Select Date",
-                choices=list(all_data.keys()),
+                choices=store.months(),
                 multiple=False,
             ),
             ui.output_text("date_note"),
+            ui.output_ui("window_picker"),
             ui.input_dark_mode(id="mode"),
         ),
         # ui.output_text("report_title"),
@@ -127,12 +166,39 @@ app_ui = ui.page_fluid(
         ui.navset_tab(
             ui.nav_panel(
                 "Data Table",
-                ui.output_table("table2"),
+                ui.output_ui("table2"),
                 ui.output_data_frame("dataframe2"),
             ),
-            ui.nav_panel("Graphs", ui.output_plot("all_charts", height="650px")),
+            ui.nav_panel(
+                "Graphs",
+                # "interactive" sends the chart's numbers and lets the browser
+                # draw them (see interactive_charts.py); "image" renders a png
+                ui.input_radio_buttons(
+                    "chart_view",
+                    None,
+                    {"image": "Image", "interactive": "Interactive"},
+                    inline=True,
+                ),
+                ui.output_ui("chart_pager"),
+                ui.panel_conditional(
+                    "input.chart_view === 'image'",
+                    ui.output_image("all_charts", height="650px"),
+                ),
+                ui.panel_conditional(
+                    "input.chart_view === 'interactive'",
+                    ui.div(id="interactive_chart", style="min-height: 650px"),
+                ),
+            ),
         ),
     ),
+    # vega, vega-lite and vega-embed are served from www/ at the exact
+    # versions the specs were written for (see www/vega-LICENSE.txt)
+    ui.head_content(
+        ui.tags.script(src="vega-5.33.0.min.js"),
+        ui.tags.script(src="vega-lite-5.23.0.min.js"),
+        ui.tags.script(src="vega-embed-6.29.0.min.js"),
+        ui.tags.script(src="interactive_charts.js"),
+    ),
     title="EDCOE Attendance Works",
     id="page",
 )
@@ -155,104 +221,138 @@ def server(input, output, session):
     def _():
         ui.update_dark_mode("dark")
 
+    # the watcher swaps months into `store` from its own thread; each session
+    # just checks the store's version number and refreshes its month list
+    @reactive.poll(lambda: store.version, 10)
+    def store_version():
+        return store.version
+
+    @reactive.effect
+    def update_months():
+        store_version()
+        with reactive.isolate():
+            selected = input.date_range()
+        months = store.months()
+        ui.update_select(
+            "date_range",
+            choices=months,
+            selected=selected if selected in months else None,
+        )
+
     @render.text
     def date_note():
-        notes = {
-            "September": "Data is for time period Aug 2024 - Sep 6, 2024",
-            "October": "Data is for time period Aug 2024 - Oct 4, 2024",
-        }
-        return notes.get(input.date_range())
+        store_version()
+        if input.date_range() not in store:
+            return
+        window = selected_window(input.date_range())
+        if window is not None:
+            start, end = window
+            return period_note(
+                {"period_start": start.isoformat(), "period_end": end.isoformat()}
+            )
+        return period_note(store.metadata(input.date_range()))
+
+    # months with daily records can be reported for any dates within them
+    @render.ui
+    def window_picker():
+        store_version()
+        selected_month = input.date_range()
+        if selected_month not in store:
+            return
+        span = store.date_span(selected_month)
+        if span is None:
+            return
+        first, last = span
+        return ui.input_date_range(
+            "window", "Dates", start=first, end=last, min=first, max=last
+        )
+
+    def selected_window(month):
+        # (start, end) of the dates picked within the month, or None for the
+        # whole month
+        span = store.date_span(month)
+        if span is None or "window" not in input:
+            return None
+        start, end = input.window()
+        if start is None or end is None:
+            return None
+        window = (max(start, span[0]), min(end, span[1]))
+        if window == span or window[0] > window[1]:
+            return None
+        return window
+
+    def selected_page(report, plotdata):
+        page = int(input.chart_page()) if "chart_page" in input else 0
+        if page >= page_count(report, plotdata):
+            # left over from another report; the picker is being reset
+            return 0
+        return page
+
+    # a key is only checked when "Log in" is pressed, in a worker thread so
+    # other sessions keep running meanwhile. keys that worked are remembered
+    # for the rest of the session so logging in again is instant.
+    verified = {}
+
+    client_ip = client_address(session.http_conn, trusted_proxies)
+
+    @reactive.extended_task
+    async def verify_key(username, input_key):
+        districts_allowed = await asyncio.get_running_loop().run_in_executor(
+            bcrypt_pool, users.check, username, input_key
+        )
+        return username, input_key, districts_allowed
+
+    # the districts the session has logged in to see. the district picker
+    # only offers these, but its value comes from the browser, so every
+    # output reads the district through selected_district
+    allowed_districts = reactive.value([])
+
+    @reactive.calc
+    def selected_district():
+        # the picked district's key, if the session may see it
+        name = input.districts()
+        req(name in allowed_districts())
+        return districts[name]
+
+    def unlock(username, districts_allowed):
+        allowed_districts.set(districts_allowed)
+        ui.update_select("districts", choices=districts_allowed)
+        ui.update_select("username", choices=[username])
 
     @reactive.effect
-    # @render.text
+    @reactive.event(input.login)
     def update_select():
-        input_key = input.secret_key().encode("utf-8")
         username = input.username()
-        if username == "COUNTY":
-            if bcrypt.checkpw(input_key, os.getenv("SECRET_KEY_EDCOE").encode("utf-8")):
-                ui.update_select("districts", choices=list(districts.keys()))
-                ui.update_select("username", choices=['COUNTY'])
-        elif username == "BOM":
-            if bcrypt.checkpw(input_key, os.getenv("SECRET_KEY_BOM").encode("utf-8")):
-                ui.update_select("districts", choices=["Black Oak Mine Unified"])
-                ui.update_select("username", choices=['BOM'])
-        elif username == "CAMINO":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_CAMINO").encode("utf-8")
-            ):
-                ui.update_select("districts", choices=["Camino Unified"])
-                ui.update_select("username", choices=['CAMINO'])
-        elif username == "EDHS":
-            if bcrypt.checkpw(input_key, os.getenv("SECRET_KEY_EDHS").encode("utf-8")):
-                ui.update_select("districts", choices=["El Dorado Union High"])
-                ui.update_select("username", choices=['EDHS'])
-        elif username == "GOAK":
-            if bcrypt.checkpw(input_key, os.getenv("SECRET_KEY_GOAK").encode("utf-8")):
-                ui.update_select("districts", choices=["Gold Oak Union Elementary"])
-                ui.update_select("username", choices=['GOAK'])
-        elif username == "GTRAIL":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_GTRAIL").encode("utf-8")
-            ):
-                ui.update_select("districts", choices=["Gold Trail Union Elementary"])
-                ui.update_select("username", choices=['GTRAIL'])
-        elif username == "LAKETAHOE":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_LAKETAHOE").encode("utf-8")
-            ):
-                ui.update_select("districts", choices=["Lake Tahoe Unified"])
-                ui.update_select("username", choices=['LAKETAHOE'])
-        elif username == "LATROBE":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_LATROBE").encode("utf-8")
-            ):
-                ui.update_select("districts", choices=["Latrobe"])
-                ui.update_select("username", choices=['LATROBE'])
-        elif username == "MOTHER":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_MOTHER").encode("utf-8")
-            ):
-                ui.update_select("districts", choices=["Mother Lode Union Elementary"])
-                ui.update_select("username", choices=['MOTHER'])
-        elif username == "PIONEER":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_PIONEER").encode("utf-8")
-            ):
-                ui.update_select("districts", choices=["Pioneer Union Elementary"])
-                ui.update_select("username", choices=['PIONEER'])
-        elif username == "PLACERV":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_PLACERV").encode("utf-8")
-            ):
-                ui.update_select("districts", choices=["Placerville Union Elementary"])
-                ui.update_select("username", choices=['PLACERV'])
-        elif username == "POLLOCK":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_POLLOCK").encode("utf-8")
-            ):
-                ui.update_select(
-                    "districts",
-                    choices=["Pollock Pines Elementary", "Silver Fork Elementary"],
-                )
-                ui.update_select("username", choices=['POLLOCK'])
-        elif username == "RESCUE":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_RESCUE").encode("utf-8")
-            ):
-                ui.update_select("districts", choices=["Rescue Union Elementary"])
-                ui.update_select("username", choices=['RESCUE'])
-        elif username == "SPED":
-            if bcrypt.checkpw(input_key, os.getenv("SECRET_KEY_SPED").encode("utf-8")):
-                ui.update_select("districts", choices=["Edcoe Sped"])
-                ui.update_select("username", choices=['SPED'])
-        elif username == "CHARTER":
-            if bcrypt.checkpw(
-                input_key, os.getenv("SECRET_KEY_CHARTER").encode("utf-8")
-            ):
-                ui.update_select("districts", choices=["Edcoe Charter"])
-                ui.update_select("username", choices=['CHARTER'])
-        else:
-            ui.update_select("districts", choices=[])
+        input_key = input.secret_key()
+        cache_key = (username, hashlib.sha256(input_key.encode("utf-8")).hexdigest())
+        if cache_key in verified:
+            unlock(username, verified[cache_key])
+            return
+        wait = login_limiter.attempt(
+            [("session", session.id), ("ip", client_ip)],
+            (client_ip, username),
+        )
+        if wait > 0:
+            ui.notification_show(
+                f"Too many login attempts, please wait {math.ceil(wait)} s and try again.",
+                type="warning",
+            )
+            return
+        verify_key(username, input_key)
+
+    @reactive.effect
+    def _():
+        username, input_key, districts_allowed = verify_key.result()
+        if districts_allowed is None:
+            login_limiter.failed((client_ip, username), [("user", username)])
+            ui.notification_show(
+                "That key doesn't match the selected user.", type="error"
+            )
+            return
+        cache_key = (username, hashlib.sha256(input_key.encode("utf-8")).hexdigest())
+        verified[cache_key] = districts_allowed
+        login_limiter.succeeded((client_ip, username))
+        unlock(username, districts_allowed)
 
     @output
     @render.text
@@ -260,168 +360,189 @@ def server(input, output, session):
         return question_titles[input.reports()]
 
     @output
-    @render.table
+    @render.ui
     def table2():
         if input.rb() == "dataframe":
             return
-        if not input.districts():
-            return
         selected_month = input.date_range()
-        selected_district = districts[input.districts()]
+        if selected_month not in store:
+            return
+        district = selected_district()
         selected_reports = reports[input.reports()]
-        if all_data[selected_month][selected_district][selected_reports] is not None:
-            all_columns = list(
-                all_data[selected_month][selected_district][selected_reports].columns
-            )
-            subsets = get_subsets(all_columns)
+        version = store.version_of(selected_month)
+        window = selected_window(selected_month)
 
-            if selected_reports != "bygrade3yrs":
-                return style_table(
-                    all_data[selected_month][selected_district][selected_reports],
-                    subsets,
-                )
+        def build_html():
+            prerendered = artifact_path(
+                prerender_dir, version, district, selected_reports, "table.html"
+            )
+            if window is None and os.path.exists(prerendered):
+                with open(prerendered) as f:
+                    return f.read()
+            report_data = store.get(selected_month, district, selected_reports, window)
+            if report_data is not None:
+                return table_html(selected_reports, report_data)
 
-            return all_data[selected_month][selected_district][selected_reports]
+        html = table_cache.get_or_compute(
+            (version, district, selected_reports, window), build_html
+        )
+        if html is not None:
+            return ui.HTML(html)
 
     @render.data_frame
     def dataframe2():
         if input.rb() == "table":
             return
-        if not input.districts():
+        selected_month = input.date_range()
+        if selected_month not in store:
             return
+        district = selected_district()
+        selected_reports = reports[input.reports()]
+        window = selected_window(selected_month)
+
+        def build_display_frame():
+            report_data = store.get(selected_month, district, selected_reports, window)
+            if report_data is not None:
+                return display_frame(report_data)
+
+        display_df = display_cache.get_or_compute(
+            (
+                store.version_of(selected_month),
+                district,
+                selected_reports,
+                window,
+            ),
+            build_display_frame,
+        )
+        if display_df is not None:
+            return style_dataframe(display_df)
+
+    # charts of long lists (schools, zip codes) are split into pages of rows and
+    # long daily histories into pages of months; the page picker only shows up
+    # when there's more than one
+    @render.ui
+    def chart_pager():
         selected_month = input.date_range()
-        selected_district = districts[input.districts()]
+        if selected_month not in store:
+            return
         selected_reports = reports[input.reports()]
-        if all_data[selected_month][selected_district][selected_reports] is not None:
-            all_columns = list(
-                all_data[selected_month][selected_district][selected_reports].columns
-            )
-            subsets = get_subsets(all_columns)
+        plotdata = store.get(
+            selected_month,
+            selected_district(),
+            selected_reports,
+            selected_window(selected_month),
+        )
+        title, labels = page_labels(selected_reports, plotdata)
+        if len(labels) <= 1:
+            return
+        return ui.input_select(
+            "chart_page",
+            title,
+            choices={str(page): label for page, label in enumerate(labels)},
+        )
 
-            return style_dataframe(
-                all_data[selected_month][selected_district][selected_reports]
-            )
+    @reactive.effect
+    async def interactive_chart():
+        if input.chart_view() != "interactive":
+            return
+        selected_month = input.date_range()
+        if selected_month not in store:
+            return
+        district = selected_district()
+        selected_reports = reports[input.reports()]
+        window = selected_window(selected_month)
+        plotdata = store.get(selected_month, district, selected_reports, window)
+        page = selected_page(selected_reports, plotdata)
+        spec = spec_cache.get_or_compute(
+            (
+                store.version_of(selected_month),
+                district,
+                selected_reports,
+                window,
+                page,
+            ),
+            lambda: chart_spec(selected_reports, plotdata, page),
+        )
+        await session.send_custom_message(
+            "interactive-chart", {"id": "interactive_chart", "spec": spec}
+        )
 
     @output
-    @render.plot
+    @render.image(delete_file=True)
     def all_charts():
-        if not input.districts():
-            return
         selected_month = input.date_range()
-        selected_district = districts[input.districts()]
+        if selected_month not in store:
+            return
+        district = selected_district()
         selected_reports = reports[input.reports()]
-        plotdata = all_data[selected_month][selected_district][selected_reports]
-        if selected_reports in ["bygrade", "bygrade_prior", "bygrade_two_yr_prior"]:
-            grade_race_gender_charts(
-                plotdata,
-                [
-                    "What percentage of students in each grade level\nhave moderate or severe chronic absence?",
-                    "What percentage of students in each grade level\nhave satisfactory attendance?",
-                ],
-            )
-        elif selected_reports == "bygrade3yrs":
-            grade_3yr_charts(plotdata)
-        elif selected_reports == "byrace":
-            grade_race_gender_charts(
-                plotdata,
-                [
-                    "What percentage of students in each race/ethnicity have\nmoderate or severe chronic absence?",
-                    "What percentage of students in each race/ethnicity have\nsatisfactory attendance?",
-                ],
-                label_rot=90,
-            )
-        elif selected_reports == "bygender":
-            plotdata = plotdata.rename(index={"M": "Male", "F": "Female"})
-            grade_race_gender_charts(
-                plotdata,
-                [
-                    "What percentage of boys and girls have moderate or severe\nchronic absence?",
-                    "What percentage of boys and girls have\nsatisfactory attendance?",
-                ],
-            )
-        elif selected_reports == "byracegender":
-            plotdata = plotdata.iloc[:-1, :]
-            grade_race_gender_charts(
-                plotdata,
-                [
-                    "What percentage of students have moderate or\nsevere chronic absence by race/ethnicity and gender?",
-                    "What percentage of students have satisfactory\nattendance by race/ethnicity and gender?",
-                ],
-                label_rot=90,
-            )
+        dark = input.mode() == "dark"
+        window = selected_window(selected_month)
 
-        elif selected_reports in ["byIEP", "byEngLearner", "byFreeReduced"]:
-            titles = {
-                "byIEP": [
-                    "Do students with special needs have higher rates of\nmoderate or severe chronic absence?",
-                    "What are the attendance patterns of students with\nspecial needs?",
-                ],
-                "byEngLearner": [
-                    "Do English Learners have different rates of moderate or severe\nchronic absence than students not learning English?",
-                    "What are the attendance patterns of English Learners?",
-                ],
-                "byFreeReduced": [
-                    "Do students with free/reduced lunch status have higher\nrates of chronic or severe chronic absence?",
-                    "What are the attendance patterns of students with\nFree/Reduced Lunch status?",
-                ],
-            }
-            sp_eng_fre_charts(
-                plotdata,
-                titles[selected_reports],
+        def prerendered(page):
+            # prerender.py only draws whole months
+            path = artifact_path(
+                prerender_dir,
+                store.version_of(selected_month),
+                district,
+                selected_reports,
+                chart_filename(page, dark),
             )
+            return path if window is None and os.path.exists(path) else None
 
-        elif selected_reports == "byracegrade":
-            race_grade_charts(plotdata)
-
-        elif selected_reports == "absence_types":
-            absence_gender_charts(plotdata)
-        elif selected_reports == "absence_by_gender":
-            absence_gender_charts(plotdata, label_rot=90)
-
-        elif selected_reports == "absence_by_grade":
-            absence_grade_charts(
-                plotdata,
-                "What is the percentage of each absence type, by grade, for chronically absent, non-chronically absent and all students?",
-                label_rot=90,
-                ha="center",
-                label_bars=False,
-            )
-        elif selected_reports == "absence_by_race":
-            absence_grade_charts(
-                plotdata,
-                "What is the percentage of each absence type, by ethnicity for chronically absent, non-chronically absent and students overall?",
-                label_rot=60,
-                ha="right",
-            )
-        elif selected_reports == "absence_by_racegender":
-            absence_grade_charts(
-                plotdata,
-                "Among chronically absent students, what is the percentage of each absence type, by race/ethnicity and gender?",
-                label_rot=60,
-                ha="right",
+        # a page that was prerendered is sent without loading the report's
+        # frame; otherwise the page is checked against the frame's pages
+        page = int(input.chart_page()) if "chart_page" in input else 0
+        path = prerendered(page)
+        if path is None:
+            plotdata = store.get(selected_month, district, selected_reports, window)
+            if plotdata is None:
+                # nothing to draw, e.g. the dates picked hold no school days
+                return
+            page = selected_page(selected_reports, plotdata)
+            path = prerendered(page)
+        if path is not None:
+            # drawn at a fixed size, so it's scaled to fit the output
+            with open(path, "rb") as f:
+                png = f.read()
+        else:
+            width = session.clientdata.output_width("all_charts")
+            height = session.clientdata.output_height("all_charts")
+            if not width or not height:
+                return
+            pixelratio = session.clientdata.pixelratio()
+            key = (
+                store.version_of(selected_month),
+                district,
+                selected_reports,
+                window,
+                dark,
+                page,
+                width,
+                height,
+                pixelratio,
             )
-        elif selected_reports == "absence_by_racegender_not":
-            absence_grade_charts(
-                plotdata,
-                "Among non-chronically absent students, what is the percentage of each absence type, by race/ethnicity and gender?",
-                label_rot=60,
-                ha="right",
+            png = chart_cache.get_or_compute(
+                key,
+                lambda: render_png(
+                    selected_reports,
+                    plotdata,
+                    width,
+                    height,
+                    pixelratio,
+                    dark,
+                    page,
+                ),
             )
-        elif selected_reports == "part1_notifications":
-            notification_plot(plotdata)
-        elif selected_reports == "part2_notifications":
-            notification_plot2(plotdata)
-        elif selected_reports == "part3_notifications":
-            notification_plot3(plotdata)
-        elif selected_reports == "part1_grade_notifications":
-            notif_grade_plot(plotdata)
-        elif selected_reports == "part2_grade_notifications":
-            notif_grade_plot2(plotdata)
-        elif selected_reports == "part3_grade_notifications":
-            notif_grade_plot3(plotdata)
-
-        elif selected_reports == "heatmap":
-            heatmap_plot(plotdata)
-
-
-app = App(app_ui, server)
+
+        # render.image wants a file; it's deleted again once it's been sent
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
+            f.write(png)
+        return {
+            "src": f.name,
+            "width": "100%",
+            "height": "100%",
+            "style": "object-fit:contain",
+        }
+
+
+app = App(app_ui, server, static_assets=os.path.join(path_to_file, "www"))
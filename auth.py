@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import bcrypt
+
+from utils import districts
+
+logger = logging.getLogger(__name__)
+
+# username -> (environment variable holding the user's bcrypt hash, districts
+# the user may see). "*" means every district.
+default_users = {
+    "COUNTY": ("SECRET_KEY_EDCOE", "*"),
+    "BOM": ("SECRET_KEY_BOM", ["Black Oak Mine Unified"]),
+    "CAMINO": ("SECRET_KEY_CAMINO", ["Camino Unified"]),
+    "EDHS": ("SECRET_KEY_EDHS", ["El Dorado Union High"]),
+    "GOAK": ("SECRET_KEY_GOAK", ["Gold Oak Union Elementary"]),
+    "GTRAIL": ("SECRET_KEY_GTRAIL", ["Gold Trail Union Elementary"]),
+    "LAKETAHOE": ("SECRET_KEY_LAKETAHOE", ["Lake Tahoe Unified"]),
+    "LATROBE": ("SECRET_KEY_LATROBE", ["Latrobe"]),
+    "MOTHER": ("SECRET_KEY_MOTHER", ["Mother Lode Union Elementary"]),
+    "PIONEER": ("SECRET_KEY_PIONEER", ["Pioneer Union Elementary"]),
+    "PLACERV": ("SECRET_KEY_PLACERV", ["Placerville Union Elementary"]),
+    "POLLOCK": (
+        "SECRET_KEY_POLLOCK",
+        ["Pollock Pines Elementary", "Silver Fork Elementary"],
+    ),
+    "RESCUE": ("SECRET_KEY_RESCUE", ["Rescue Union Elementary"]),
+    "SPED": ("SECRET_KEY_SPED", ["Edcoe Sped"]),
+    "CHARTER": ("SECRET_KEY_CHARTER", ["Edcoe Charter"]),
+}
+
+
+class UserRegistry:
+    """Users, their bcrypt key hashes and the districts each may see.
+
+    ``users`` maps username -> (bcrypt hash, districts). Hashes and district
+    lists are resolved once, so a login is one dict lookup and one bcrypt check.
+    """
+
+    def __init__(self, users):
+        self._users = {}
+        for username, (key_hash, allowed) in users.items():
+            if allowed == "*":
+                allowed = list(districts.keys())
+            unknown = [d for d in allowed if d not in districts]
+            if unknown:
+                raise ValueError(f"{username}: unknown districts {unknown}")
+            if isinstance(key_hash, str):
+                key_hash = key_hash.encode("utf-8")
+            self._users[username] = (key_hash, list(allowed))
+
+    def usernames(self):
+        return list(self._users)
+
+    def __contains__(self, username):
+        return username in self._users
+
+    def check(self, username, input_key):
+        # returns the districts this user may see, or None if the key is wrong.
+        # bcrypt is deliberately slow, so call this from a worker thread
+        if username not in self._users:
+            return None
+        key_hash, allowed = self._users[username]
+        if bcrypt.checkpw(input_key.encode("utf-8"), key_hash):
+            return list(allowed)
+        return None
+
+
+class LoginLimiter:
+    """Keeps password guessing from tying up the server's CPUs with bcrypt.
+
+    Every attempt takes a token from a bucket per client, e.g. ("session", id)
+    and ("ip", address). ``limits`` gives (tokens per second, bucket size) for
+    each kind of client. An account (an (ip, username) pair) is locked for
+    ``base_delay * 2 ** n`` seconds, capped at ``max_delay``, after its n-th
+    failure past ``free_failures``. A success clears them.
+
+    Only failures take from the buckets passed to ``failed``, e.g.
+    ("user", username), so nobody can drain them with attempts of their own
+    and keep the right key out. A failure that finds one of them empty locks
+    its account for ``max_delay`` straight away, which holds a guesser
+    rotating through addresses to one guess per address.
+    """
+
+    def __init__(
+        self, limits, free_failures=3, base_delay=2, max_delay=300, clock=time.monotonic
+    ):
+        self.limits = limits
+        self.free_failures = free_failures
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self._buckets = {}  # client -> (tokens, time of last update)
+        self._failures = {}  # account -> (failures, locked until)
+        self._lock = threading.Lock()
+
+    def _tokens(self, client, now):
+        rate, burst = self.limits[client[0]]
+        tokens, last = self._buckets.get(client, (burst, now))
+        return min(burst, tokens + (now - last) * rate)
+
+    def attempt(self, clients, account):
+        """Return 0 and take a token per client if an attempt is allowed now,
+        otherwise the number of seconds to wait."""
+        with self._lock:
+            now = self.clock()
+            wait = self._failures.get(account, (0, now))[1] - now
+            tokens = {client: self._tokens(client, now) for client in clients}
+            for client, n in tokens.items():
+                if n < 1:
+                    wait = max(wait, (1 - n) / self.limits[client[0]][0])
+            if wait > 0:
+                return wait
+            for client, n in tokens.items():
+                self._buckets[client] = (n - 1, now)
+            if len(self._buckets) > 10_000:
+                self._prune(now)
+            return 0
+
+    def failed(self, account, clients=()):
+        with self._lock:
+            now = self.clock()
+            failures = self._failures.get(account, (0, 0))[0] + 1
+            delay = 0
+            if failures > self.free_failures:
+                delay = min(
+                    self.max_delay,
+                    self.base_delay * 2 ** (failures - self.free_failures - 1),
+                )
+            for client in clients:
+                n = self._tokens(client, now)
+                if n < 1:
+                    delay = self.max_delay
+                self._buckets[client] = (max(0, n - 1), now)
+            self._failures[account] = (failures, now + delay)
+
+    def succeeded(self, account):
+        with self._lock:
+            self._failures.pop(account, None)
+
+    def _prune(self, now):
+        # full buckets and long expired lockouts carry no information
+        for client in list(self._buckets):
+            if self._tokens(client, now) >= self.limits[client[0]][1]:
+                del self._buckets[client]
+        for account, (_, locked_until) in list(self._failures.items()):
+            if now - locked_until > self.max_delay:
+                del self._failures[account]
+
+
+def client_address(http_conn, trusted_proxies=0):
+    """The address a login is rate limited by.
+
+    X-Forwarded-For is written by whoever sends the request, so it's only used
+    behind ``trusted_proxies`` reverse proxies, each of which appends the
+    address it got the request from. The entry the outermost proxy appended
+    is the client; anything before it is up to the client.
+    """
+    if trusted_proxies > 0:
+        hops = [
+            hop.strip()
+            for hop in http_conn.headers.get("x-forwarded-for", "").split(",")
+            if hop.strip()
+        ]
+        if len(hops) >= trusted_proxies:
+            return hops[-trusted_proxies]
+    return http_conn.client.host
+
+
+def load_users(config_path=None):
+    """Build the registry from a json file, or from the SECRET_KEY_* variables.
+
+    The file maps each username to its districts and either its bcrypt hash or
+    the environment variable holding it, so several users can share a
+    district:
+
+        {"COUNTY": {"key_env": "SECRET_KEY_EDCOE", "districts": "*"},
+         "jdoe": {"key_hash": "$2b$12$...", "districts": ["Camino Unified"]}}
+    """
+    if config_path:
+        with open(config_path) as f:
+            config = json.load(f)
+        entries = {
+            username: (
+                user.get("key_hash") or os.getenv(user.get("key_env", "")),
+                user["districts"],
+            )
+            for username, user in config.items()
+        }
+    else:
+        entries = {
+            username: (os.getenv(key_env), allowed)
+            for username, (key_env, allowed) in default_users.items()
+        }
+
+    users = {}
+    for username, (key_hash, allowed) in entries.items():
+        if not key_hash:
+            logger.warning("no key configured for user %s, skipping", username)
+            continue
+        users[username] = (key_hash, allowed)
+    return UserRegistry(users)
@@ -1,13 +1,84 @@
-import matplotlib.pyplot as plt
+import io
+import logging
+import math
+import time
+from contextlib import contextmanager
+import matplotlib.style as mplstyle
+from matplotlib.artist import setp
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import offset_copy
 import matplotlib.ticker as mtick
-import seaborn as sns
-import datetime as dt
 import numpy as np
 import pandas as pd
 
+from utils import column_colors
+
+logger = logging.getLogger(__name__)
+
+
+def colors_of(columns):
+    # a series is drawn in the color its column is shaded in the tables
+    return [column_colors[column] for column in columns]
+
+
+def label_bars(
+    ax,
+    plotdata,
+    fmt="{0:.1%}",
+    fontsize=8,
+    label_type="center",
+    counts=None,
+    min_value=0,
+):
+    # labels every bar segment on ax. plotdata is what was plotted (one column
+    # per series, in plotting order); counts, if given, has the same shape and
+    # is passed to fmt as {1}. label_type "center" puts the label in the
+    # middle of its segment, "edge" just past its end. Bars that aren't above
+    # min_value are left unlabelled, unless it's None. Each label is an
+    # ax.text, which isn't clipped, so labels above the top bar still show.
+    if isinstance(plotdata, pd.Series):
+        plotdata = plotdata.to_frame()
+    values = plotdata.to_numpy()
+    extra = values if counts is None else np.asarray(counts)
+    labels = np.array(
+        [fmt.format(v, c) for v, c in zip(values.ravel("F"), extra.ravel("F"))],
+        dtype=object,
+    )
+    if min_value is not None:
+        labels[~(values.ravel("F") > min_value)] = ""
 
-def grade_3yr_charts(input_data):
-    fig, ax = plt.subplots()
+    # x, y, width, height of every bar; the containers hold them series after
+    # series, like the labels
+    bars = np.array(
+        [
+            [p.get_x(), p.get_y(), p.get_width(), p.get_height()]
+            for container in ax.containers
+            for p in container
+        ]
+    ).reshape(-1, 4)
+    x, y, w, h = bars.T
+    horizontal = ax.containers and ax.containers[0].orientation == "horizontal"
+    if label_type == "center":
+        xy = np.column_stack([x + w / 2, y + h / 2])
+        ha, va, offset = "center", "center", (0, 0)
+    elif horizontal:
+        xy = np.column_stack([x + w, y + h / 2])
+        ha, va, offset = "left", "center", (2, 0)
+    else:
+        xy = np.column_stack([x + w / 2, y + h])
+        ha, va, offset = "center", "bottom", (0, 2)
+    dx, dy = offset
+    transform = offset_copy(ax.transData, ax.figure, dx, dy, units="points")
+    for (x, y), label in zip(xy, labels):
+        if label:
+            ax.text(
+                x, y, label, ha=ha, va=va, fontsize=fontsize, transform=transform
+            )
+
+
+def grade_3yr_charts(fig, input_data):
+    ax = fig.axes[0]
     rows = len(input_data)
     data1 = input_data.iloc[: rows // 3, 5].rename("2024-25")
     data2 = input_data.iloc[rows // 3 : 2 * rows // 3, 5].rename("2023-24")
@@ -25,147 +96,56 @@ def grade_3yr_charts(input_data):
     ax.tick_params(axis="x", labelrotation=0)
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0, 0))
     ax.set_title("Percentage of Students with Moderate or Severe Chronic Absence Over Time, by Grade Level")
-    for i in range(len(plotdata)):
-        y1 = plotdata.iloc[i, 0]
-        y2 = plotdata.iloc[i, 1]
-        y3 = plotdata.iloc[i, 2]
-
-        ax.text(
-            i - 0.17,
-            y1 ,
-            "{0:.1%}".format(y1),
-            ha="center",
-        )
-        ax.text(
-            i,
-            y2 ,
-            "{0:.1%}".format(y2),
-            ha="center",
-        )
-        ax.text(
-            i + 0.17,
-            y3 ,
-            "{0:.1%}".format(y3),
-            ha="center",
-        )
+    label_bars(ax, plotdata, fontsize=10, label_type="edge", min_value=None)
 
 
-def notif_grade_plot(input_data):
-    fig, ax = plt.subplots()
+def notif_grade_plot(fig, input_data):
+    ax = fig.axes[0]
     plotdata = input_data.iloc[:-1, [3, 5, 7, 9]]
-    plotdata.plot(
-        kind="bar",
-        stacked=True,
-        ax=ax,
-        color=["#e6b8b7", "#b8cce4", "#95b3d7", "#366092"],
-    )
+    plotdata.plot(kind="bar", stacked=True, ax=ax, color=colors_of(plotdata.columns))
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0, 0))
-    for i in range(len(plotdata)):
-        noNotif = plotdata["No Notifications PERCENT"].iloc[i]
-        letterOnly = plotdata["Excessive Absence Letter (only) PERCENT"].iloc[i]
-        noticeOnly = plotdata["Notice of Truancy (only) PERCENT"].iloc[i]
-        both = plotdata[
-            "BOTH: Excessive Absence Letter AND Notice of Truancy PERCENT"
-        ].iloc[i]
-
-        fontsz = -0.5 * len(plotdata) + 14
-        ax.text(
-            i,
-            noNotif / 2,
-            "{0:.1%}".format(noNotif),
-            fontsize=fontsz,
-            ha="center",
-        )
-        ax.text(
-            i,
-            noNotif + letterOnly / 2,
-            "{0:.1%}".format(letterOnly),
-            fontsize=fontsz,
-            ha="center",
-        )
-        ax.text(
-            i,
-            noNotif + letterOnly + noticeOnly / 2,
-            "{0:.1%}".format(noticeOnly),
-            fontsize=fontsz,
-            ha="center",
-        )
-        ax.text(
-            i,
-            noNotif + letterOnly + noticeOnly + both / 2,
-            "{0:.1%}".format(both),
-            fontsize=fontsz,
-            ha="center",
-        )
+    fontsz = -0.5 * len(plotdata) + 14
+    label_bars(ax, plotdata, fontsize=fontsz, min_value=None)
 
 
-def notif_grade_plot2(input_data):
-    fig, ax = plt.subplots()
+def notif_grade_plot2(fig, input_data):
+    ax = fig.axes[0]
     plotdata = input_data.iloc[:-1, [3, 5, 7, 9]]
-    plotdata.plot(
-        kind="bar",
-        stacked=True,
-        ax=ax,
-        color=["#ffff99", "#d8e4bc", "#c4d79b", "#9bbb59"],
-    )
+    plotdata.plot(kind="bar", stacked=True, ax=ax, color=colors_of(plotdata.columns))
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0, 0))
-    for i in range(len(plotdata)):
-        zeroNOT = plotdata["PERCENT Zero NOTs"].iloc[i]
-        oneNOT = plotdata["PERCENT One NOT"].iloc[i]
-        twoNOT = plotdata["PERCENT Two Notices"].iloc[i]
-        threeNOT = plotdata["PERCENT Three or More"].iloc[i]
+    fontsz = -0.5 * len(plotdata) + 14
+    label_bars(ax, plotdata, fontsize=fontsz, min_value=None)
 
-        fontsz = -0.5 * len(plotdata) + 14
-        ax.text(
-            i,
-            zeroNOT / 2,
-            "{0:.1%}".format(zeroNOT),
-            fontsize=fontsz,
-            ha="center",
-        )
-        ax.text(
-            i,
-            zeroNOT + oneNOT / 2,
-            "{0:.1%}".format(oneNOT),
-            fontsize=fontsz,
-            ha="center",
-        )
-        ax.text(
-            i,
-            zeroNOT + oneNOT + twoNOT / 2,
-            "{0:.1%}".format(twoNOT),
-            fontsize=fontsz,
-            ha="center",
-        )
-        ax.text(
-            i,
-            zeroNOT + oneNOT + twoNOT + threeNOT / 2,
-            "{0:.1%}".format(threeNOT),
-            fontsize=fontsz,
-            ha="center",
-        )
 
-
-def notif_grade_plot3(input_data):
-    fig, ax = plt.subplots()
+def notif_grade_plot3(fig, input_data):
+    ax = fig.axes[0]
     plotdata = input_data.iloc[:-1, 2]
-    plotdata.plot(kind="bar", ax=ax, color=["#f79443"])
+    plotdata.plot(kind="bar", ax=ax, color=colors_of([plotdata.name]))
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0, 1))
-    for i in range(len(plotdata)):
-        excess = plotdata.iloc[i]
+    fontsz = -0.5 * len(plotdata) + 14
+    label_bars(ax, plotdata, fontsize=fontsz, min_value=None)
+
 
-        fontsz = -0.5 * len(plotdata) + 14
+def draw_pie(ax, numbers, **kwargs):
+    # ax.pie can't share out nothing, e.g. over dates when no student was
+    # chronically absent, so the panel just says so
+    numbers = np.nan_to_num(np.asarray(numbers, dtype=float))
+    if not numbers.sum() > 0:
         ax.text(
-            i,
-            excess / 2,
-            "{0:.1%}".format(excess),
-            fontsize=fontsz,
+            0.5,
+            0.5,
+            "No students in this category",
             ha="center",
+            va="center",
+            transform=ax.transAxes,
         )
+        ax.set_axis_off()
+        return
+    ax.pie(numbers, **kwargs)
 
 
-def notification_plot(input_data):
-    fig, ax = plt.subplots()
+def notification_plot(fig, input_data):
+    ax = fig.axes[0]
     plotdata = input_data.iloc[0, [2, 4, 6, 8]]
     keys = [
         "No Notifications",
@@ -174,23 +154,25 @@ def notification_plot(input_data):
         "BOTH Excessive Letter and Notice of Truancy",
     ]
     numbers = plotdata.tolist()
-    plt.pie(
+    draw_pie(
+        ax,
         numbers,
         labels=keys,
-        colors=["#e6b8b7", "#b8cce4", "#95b3d7", "#366092"],
+        colors=colors_of(plotdata.index),
         autopct="%.1f%%",
     )
 
 
-def notification_plot2(input_data):
-    fig, ax = plt.subplots()
+def notification_plot2(fig, input_data):
+    ax = fig.axes[0]
     plotdata = input_data.iloc[0, [1, 3, 5, 7]]
     keys = ["Zero NOTs", "One Notice", "Two Notices", "Three or More Notices"]
     numbers = plotdata.tolist()
-    plt.pie(
+    draw_pie(
+        ax,
         numbers,
         labels=keys,
-        colors=["#ffff99", "#d8e4bc", "#c4d79b", "#9bbb59"],
+        colors=colors_of(plotdata.index),
         autopct="%.1f%%",
     )
     ax.set_title(
@@ -198,13 +180,13 @@ def notification_plot2(input_data):
     )
 
 
-def notification_plot3(input_data):
-    fig, ax = plt.subplots()
-    print(input_data)
+def notification_plot3(fig, input_data):
+    ax = fig.axes[0]
     plotdata = input_data.iloc[0, [1, 3]]
     keys = ["No Excessive Letter", "Excessive Letter Sent"]
     numbers = plotdata.tolist()
-    plt.pie(
+    draw_pie(
+        ax,
         numbers,
         labels=keys,
         colors=["#fcd5b5", "#e46c0a"],
@@ -216,131 +198,203 @@ def notification_plot3(input_data):
 
 
 def label_days(ax, dates, i, j, calendar, pct=False):
-    ni, nj = calendar.shape
-    day_of_month = np.nan * np.zeros((ni, 5))
-    day_of_month[i, j] = [d.day for d in dates]
-
-    for (i, j), day in np.ndenumerate(day_of_month):
-        if np.isfinite(day):
-            ax.text(j - 0.4, i - 0.4, int(day), ha="center", va="center", fontsize=7)
-        if np.isfinite(calendar[i][j]):
-            if pct:
-                ax.text(
-                    j,
-                    i,
-                    str(int(100 * calendar[i][j])) + "%",
-                    ha="center",
-                    va="center",
-                    fontsize=12,
-                )
-            else:
-                ax.text(
-                    j,
-                    i,
-                    int(calendar[i][j]),
-                    ha="center",
-                    va="center",
-                    fontsize=12,
-                )
+    # day of the month in the corner of each cell, its value in the middle
+    dates = pd.DatetimeIndex(dates)
+    for x, y, day in zip(j - 0.4, i - 0.4, dates.day):
+        ax.text(x, y, day, ha="center", va="center", fontsize=7)
+    rows, cols = np.nonzero(np.isfinite(calendar))
+    for x, y, v in zip(cols, rows, calendar[rows, cols]):
+        label = str(int(100 * v)) + "%" if pct else str(int(v))
+        ax.text(x, y, label, ha="center", va="center", fontsize=12)
 
     ax.set(xticks=np.arange(5), xticklabels=["M", "T", "W", "R", "F"])
     ax.xaxis.tick_top()
 
 
+month_labels = np.array(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+)
+
+
+def month_number(dates):
+    # months since year 0, so months of different years are told apart
+    return dates.year * 12 + dates.month - 1
+
+
 def label_months(ax, dates, i, j, calendar):
-    month_labels = np.array(
-        [
-            "Jan",
-            "Feb",
-            "Mar",
-            "Apr",
-            "May",
-            "Jun",
-            "Jul",
-            "Aug",
-            "Sep",
-            "Oct",
-            "Nov",
-            "Dec",
-        ]
-    )
-    months = np.array([d.month for d in dates])
-    uniq_months = sorted(set(months))
-    yticks = [i[months == m].mean() for m in uniq_months]
-    labels = [month_labels[m - 1] for m in uniq_months]
-    ax.set(yticks=yticks)
-    ax.set_yticklabels(labels, rotation=90)
-
-
-def calendar_array(dates, data):
-    i, j = zip(*[d.isocalendar()[1:] for d in dates])
-    i = np.array(i) - min(i)
-    j = np.array(j) - 1
-    ni = max(i) + 1
-
-    calendar = np.nan * np.zeros((ni, 5))
-    calendar[i, j] = data
+    # each month is labelled at the middle of its weeks. months are told apart
+    # by year too, so several years of data don't run together
+    dates = pd.DatetimeIndex(dates)
+    weeks = pd.Series(i).groupby(month_number(dates)).mean()
+    ax.set(yticks=weeks.to_numpy())
+    ax.set_yticklabels(month_labels[weeks.index % 12], rotation=90)
+
+
+def calendar_index(dates):
+    # row (weeks since the monday on or before the first date) and column
+    # (0 = monday) of each date. counting weeks from the first monday rather
+    # than using iso week numbers keeps school years that run from one
+    # calendar year into the next in order
+    dates = pd.DatetimeIndex(dates).normalize()
+    first_monday = dates.min() - pd.Timedelta(days=dates.min().weekday())
+    i = np.asarray((dates - first_monday).days // 7)
+    j = np.asarray(dates.weekday)
+    return i, j
+
+
+def calendar_array(dates, data, index=None):
+    # index is calendar_index(dates), when it has already been worked out
+    i, j = calendar_index(dates) if index is None else index
+    calendar = np.full((i.max() + 1, 5), np.nan)
+    # only weekdays have a column
+    weekday = j < 5
+    calendar[i[weekday], j[weekday]] = np.asarray(data, dtype=float)[weekday]
     return i, j, calendar
 
 
-def calendar_heatmap(ax, dates, data, pct=False):
-    i, j, calendar = calendar_array(dates, data)
-    # print(i, j, calendar)
+def calendar_heatmap(ax, dates, data, pct=False, index=None):
+    dates = pd.DatetimeIndex(dates)
+    i, j, calendar = calendar_array(dates, data, index)
+    weekday = j < 5
     im = ax.imshow(calendar, interpolation="none", cmap="viridis")
-    label_days(ax, dates, i, j, calendar, pct)
+    label_days(ax, dates[weekday], i[weekday], j[weekday], calendar, pct)
     label_months(ax, dates, i, j, calendar)
     ax.figure.colorbar(im)
 
 
-def heatmap_plot(plotdata):
+# months of days drawn on each page of the heatmap, about a school term
+MONTHS_PER_PAGE = 3
+
+
+def heatmap_windows(dates, months_per_page=MONTHS_PER_PAGE):
+    # window of months_per_page months, counted from the first month, that
+    # each date falls in, and the windows that have any days
+    months = month_number(dates)
+    windows = np.asarray((months - months.min()) // months_per_page)
+    return windows, np.unique(windows)
+
+
+def heatmap_page_labels(plotdata, months_per_page=MONTHS_PER_PAGE):
+    # history too long for one page starts with an overview of every week,
+    # followed by a page of days per window of months
+    if plotdata is None or not len(plotdata):
+        return ["All days"]
+    dates = pd.DatetimeIndex(plotdata.index)
+    _, windows = heatmap_windows(dates, months_per_page)
+    if len(windows) == 1:
+        return ["All days"]
+    labels = ["All weeks"]
+    first = month_number(dates).min()
+    for window in windows:
+        start = first + window * months_per_page
+        end = start + months_per_page - 1
+        if start // 12 == end // 12:
+            labels.append(
+                f"{month_labels[start % 12]}-{month_labels[end % 12]} {end // 12}"
+            )
+        else:
+            labels.append(
+                f"{month_labels[start % 12]} {start // 12}-"
+                f"{month_labels[end % 12]} {end // 12}"
+            )
+    return labels
+
+
+def heatmap_page(plotdata, page=0, months_per_page=MONTHS_PER_PAGE):
+    # the days drawn on a page of the heatmap, or None on the weekly overview
+    dates = pd.DatetimeIndex(plotdata.index)
+    windows, pages = heatmap_windows(dates, months_per_page)
+    if len(pages) == 1:
+        return plotdata
+    if page <= 0:
+        return None
+    return plotdata[windows == pages[min(page, len(pages)) - 1]]
+
+
+def weekly_totals(plotdata):
+    # weekly totals, and the average of the days' percentages, by monday
+    dates = pd.DatetimeIndex(plotdata.index)
+    mondays = dates.normalize() - pd.to_timedelta(dates.weekday, unit="D")
+    return plotdata.groupby(mondays).agg({"combined": "sum", "pctAbsent": "mean"})
+
+
+# columns of the weekly overview. A school year runs from the monday on or
+# before july 1st to june 30th, which spans 54 mondays when july 1st is a
+# sunday in a leap year
+WEEKS_PER_YEAR = 54
+
+
+def school_year_index(weeks):
+    # row (school years, which start in july, since the first one) and column
+    # (weeks since the monday on or before july 1st) of each week's monday
+    weeks = pd.DatetimeIndex(weeks)
+    years = np.asarray(weeks.year - (weeks.month < 7))
+    starts = pd.to_datetime(pd.DataFrame({"year": years, "month": 7, "day": 1}))
+    mondays = pd.DatetimeIndex(starts - pd.to_timedelta(starts.dt.weekday, unit="D"))
+    cols = np.asarray((weeks - mondays).days // 7)
+    return years - years.min(), cols, years.min()
+
+
+def weekly_heatmap(ax, weeks, data):
+    # one row per school year and one cell per week, without labels in the
+    # cells, so it takes as long to draw however many years there are
+    rows, cols, first_year = school_year_index(weeks)
+    grid = np.full((rows.max() + 1, WEEKS_PER_YEAR), np.nan)
+    grid[rows, cols] = np.asarray(data, dtype=float)
+    im = ax.imshow(grid, aspect="auto", interpolation="none", cmap="viridis")
+
+    # months are marked where they start in the first school year
+    start = pd.Timestamp(first_year, 7, 1)
+    month_starts = pd.date_range(start, periods=12, freq="MS")
+    days = (month_starts - (start - pd.Timedelta(days=start.weekday()))).days
+    ax.set_xticks(np.asarray(days) / 7 - 0.5)
+    ax.set_xticklabels(month_labels[month_starts.month - 1], fontsize=8)
+    ax.xaxis.tick_top()
+    years = first_year + np.arange(grid.shape[0])
+    ax.set_yticks(np.arange(grid.shape[0]))
+    ax.set_yticklabels(
+        [f"{year}-{(year + 1) % 100:02d}" for year in years], rotation=90, va="center"
+    )
+    ax.figure.colorbar(im)
+
+
+def heatmap_plot(fig, plotdata, page=0, months_per_page=MONTHS_PER_PAGE):
     # https://stackoverflow.com/questions/32485907/matplotlib-and-numpy-create-a-calendar-heatmap
     if plotdata is None:
         return None
 
-    dates = plotdata.index.to_list()
-    data = plotdata.combined.to_list()
+    axs = fig.axes
+    days = heatmap_page(plotdata, page, months_per_page)
+    if days is None:
+        weekly = weekly_totals(plotdata)
+        weekly_heatmap(axs[0], weekly.index, weekly.combined.to_numpy())
+        axs[0].set_title("Total Absences Per Week")
+        weekly_heatmap(axs[1], weekly.index, weekly.pctAbsent.to_numpy())
+        axs[1].set_title("Average % Absent Per Week")
+        return
+    # only the days of the page's window are laid out and labelled
+    plotdata = days
+    dates = pd.DatetimeIndex(plotdata.index)
+
+    # both calendars have the same days in the same cells
+    index = calendar_index(dates)
 
-    fig, axs = plt.subplots(1, 2, figsize=(14, 10))
     ax = axs[0]
-    calendar_heatmap(ax, dates, data)
+    calendar_heatmap(ax, dates, plotdata.combined.to_numpy(), index=index)
     ax.set_title("Total Absences Per Day")
     ax = axs[1]
-    calendar_heatmap(ax, dates, plotdata.pctAbsent.to_list(), pct=True)
+    calendar_heatmap(ax, dates, plotdata.pctAbsent.to_numpy(), pct=True, index=index)
     ax.set_title("% Absent Per Day")
 
 
 def label_plot(plotdata, ax, fmt_string, fntsize=8):
-    for i in range(len(plotdata)):
-        excused_pct = plotdata.Excused.iloc[i]
-        unexcused_pct = plotdata.Unexcused.iloc[i]
-        suspension_pct = plotdata.Suspension.iloc[i]
-        if excused_pct > 0:
-            ax.text(
-                i,
-                excused_pct / 2,
-                fmt_string.format(excused_pct),
-                fontsize=fntsize,
-                ha="center",
-            )
-        if unexcused_pct > 0:
-            ax.text(
-                i,
-                unexcused_pct / 2 + excused_pct,
-                fmt_string.format(unexcused_pct),
-                fontsize=fntsize,
-                ha="center",
-            )
-        if suspension_pct > 0:
-            ax.text(
-                i,
-                suspension_pct / 2 + excused_pct + unexcused_pct,
-                fmt_string.format(suspension_pct),
-                fontsize=fntsize,
-                ha="center",
-            )
+    # excused / unexcused / suspension segments, labelled in their middle
+    label_bars(ax, plotdata, fmt_string, fontsize=fntsize)
 
 
-def absence_grade_charts(input_data, title, label_rot=0, ha="center", label_bars=True):
+def absence_grade_charts(
+    fig, input_data, title, label_rot=0, ha="center", label_bars=True
+):
     plotdata = input_data.rename(
         index={
             "Chronically Absent": "Chronic",
@@ -356,15 +410,15 @@ def absence_grade_charts(input_data, title, label_rot=0, ha="center", label_bars
         },
     ).iloc[:, [2, 4, 6]]
 
-    fig, ax = plt.subplots()
+    ax = fig.axes[0]
     ax.set_title(title)
     plotdata.plot(
-        kind="bar", stacked=True, ax=ax, color=["#8db4e2", "#e6b8b7", "#ff6d6d"]
+        kind="bar", stacked=True, ax=ax, color=colors_of(input_data.columns[[2, 4, 6]])
     )
     ax.grid(axis="y")
     ax.tick_params(axis="x", labelrotation=label_rot)
     if ha != "center":
-        plt.setp(ax.get_xticklabels(), ha=ha, rotation_mode="anchor")
+        setp(ax.get_xticklabels(), ha=ha, rotation_mode="anchor")
     ymin, ymax = ax.get_ylim()
     ax.set_ylim([ymin, ymax * 1.05])
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0, 0))
@@ -373,7 +427,7 @@ def absence_grade_charts(input_data, title, label_rot=0, ha="center", label_bars
         label_plot(plotdata, ax, "{0:.1%}", fntsize=6)
 
 
-def absence_gender_charts(input_data, label_rot=0):
+def absence_gender_charts(fig, input_data, label_rot=0):
     plotdata_ = input_data.rename(
         index={
             "Chronically Absent Students": "Chronically Absent",
@@ -389,15 +443,14 @@ def absence_gender_charts(input_data, label_rot=0):
         },
     )
     plotdata = plotdata_.iloc[:, [2, 4, 6]]
+    colors = colors_of(input_data.columns[[2, 4, 6]])
 
-    fig, axs = plt.subplots(1, 2)
+    axs = fig.axes
     fig.suptitle(
         "How does the breakdown of absences differ based on whether students were chronically absent or not?"
     )
     ax = axs[0]
-    plotdata.plot(
-        kind="bar", stacked=True, ax=ax, color=["#8db4e2", "#e6b8b7", "#ff6d6d"]
-    )
+    plotdata.plot(kind="bar", stacked=True, ax=ax, color=colors)
     ax.grid(axis="y")
     # ax.set_title()
     ax.tick_params(axis="x", labelrotation=label_rot)
@@ -410,9 +463,7 @@ def absence_gender_charts(input_data, label_rot=0):
     plotdata = plotdata_.iloc[:, [1, 3, 5]]
 
     ax = axs[1]
-    plotdata.plot(
-        kind="bar", stacked=True, ax=ax, color=["#8db4e2", "#e6b8b7", "#ff6d6d"]
-    )
+    plotdata.plot(kind="bar", stacked=True, ax=ax, color=colors)
     ax.grid(axis="y")
     # ax.set_title()
     ax.tick_params(axis="x", labelrotation=label_rot)
@@ -421,7 +472,7 @@ def absence_gender_charts(input_data, label_rot=0):
     label_plot(plotdata, ax, "{0:,}")
 
 
-def race_grade_charts(input_data):
+def race_grade_charts(fig, input_data):
     plotdata = (
         input_data.rename(
             columns={"PERCENT ALL chronic absence (severe + moderate)": "All Chronic"}
@@ -432,7 +483,7 @@ def race_grade_charts(input_data):
         .droplevel(0, axis=1)
     )
     plotdata.columns.name = ""
-    fig, ax = plt.subplots()
+    ax = fig.axes[0]
     plotdata.plot(
         kind="line",
         ax=ax,
@@ -448,9 +499,16 @@ def race_grade_charts(input_data):
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0, 0))
 
 
-def sp_eng_fre_charts(input_data, chart_titles, label_rot=0):
+def chronic_counts(input_data):
+    # counts for the severe and moderate bars, which leave out the total row
+    return input_data.iloc[:-1].loc[
+        :, ["NUMBER severe chronic absence", "NUMBER moderate chronic absence"]
+    ]
+
+
+def sp_eng_fre_charts(fig, input_data, chart_titles, label_rot=0):
 
-    fig, axs = plt.subplots(1, 2)
+    axs = fig.axes
     ax = axs[0]
     plotdata = input_data.iloc[:-1, [1, 3]].rename(
         columns={
@@ -458,7 +516,9 @@ def sp_eng_fre_charts(input_data, chart_titles, label_rot=0):
             "PERCENT moderate chronic absence": "Moderate",
         }
     )
-    plotdata.plot(kind="bar", stacked=True, ax=ax, color=["#ffc000", "#ffcc99"])
+    plotdata.plot(
+        kind="bar", stacked=True, ax=ax, color=colors_of(input_data.columns[[1, 3]])
+    )
 
     ax.grid(axis="y")
     ax.set_title(chart_titles[0])
@@ -467,27 +527,14 @@ def sp_eng_fre_charts(input_data, chart_titles, label_rot=0):
     ax.set_ylim([ymin, ymax * 1.1])
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0, 0))
 
-    for i in range(len(plotdata)):
-        severe_pct = plotdata["Severe Chronic"].iloc[i]
-        severe_cnt = input_data["NUMBER severe chronic absence"].iloc[i]
-        if severe_pct > 0:
-            ax.text(
-                i,
-                severe_pct,
-                "{0:.1%}\n{1}".format(severe_pct, severe_cnt),
-                fontsize=10,
-                ha="center",
-            )
-        moderate_pct = plotdata["Moderate"].iloc[i]
-        moderate_cnt = input_data["NUMBER moderate chronic absence"].iloc[i]
-        if moderate_pct > 0:
-            ax.text(
-                i,
-                moderate_pct + severe_pct,
-                "{0:.1%}\n{1}".format(moderate_pct, moderate_cnt),
-                fontsize=10,
-                ha="center",
-            )
+    label_bars(
+        ax,
+        plotdata,
+        "{0:.1%}\n{1}",
+        fontsize=10,
+        label_type="edge",
+        counts=chronic_counts(input_data),
+    )
 
     plotdata = input_data.iloc[0, [4, 6, 8]]
     ax = axs[1]
@@ -498,10 +545,11 @@ def sp_eng_fre_charts(input_data, chart_titles, label_rot=0):
     ]
     numbers = plotdata.tolist()
     explode = [0.1, 0, 0]
-    plt.pie(
+    draw_pie(
+        ax,
         numbers,
         labels=keys,
-        colors=["#ff6d6d", "#ffff99", "#c3d69b"],
+        colors=colors_of(plotdata.index),
         autopct="%.1f%%",
         explode=explode,
     )
@@ -509,9 +557,9 @@ def sp_eng_fre_charts(input_data, chart_titles, label_rot=0):
     ax.set_title(chart_titles[1])
 
 
-def grade_race_gender_charts(input_data, chart_titles, label_rot=0):
+def grade_race_gender_charts(fig, input_data, chart_titles, label_rot=0):
 
-    fig, axs = plt.subplots(1, 2)
+    axs = fig.axes
     ax = axs[0]
     plotdata = input_data.iloc[:-1, [1, 3]].rename(
         columns={
@@ -519,7 +567,9 @@ def grade_race_gender_charts(input_data, chart_titles, label_rot=0):
             "PERCENT moderate chronic absence": "Moderate",
         }
     )
-    plotdata.plot(kind="bar", stacked=True, ax=ax, color=["#ffc000", "#ffcc99"])
+    plotdata.plot(
+        kind="bar", stacked=True, ax=ax, color=colors_of(input_data.columns[[1, 3]])
+    )
 
     ax.grid(axis="y")
     ax.set_title(chart_titles[0])
@@ -528,32 +578,19 @@ def grade_race_gender_charts(input_data, chart_titles, label_rot=0):
     ax.set_ylim([ymin, ymax * 1.1])
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0, 0))
 
-    for i in range(len(plotdata)):
-        fontsz = -0.5 * len(plotdata) + 14
-        severe_pct = plotdata["Severe Chronic"].iloc[i]
-        severe_cnt = input_data["NUMBER severe chronic absence"].iloc[i]
-        if severe_pct > 0:
-            ax.text(
-                i,
-                severe_pct,
-                "{0:.1%}\n{1}".format(severe_pct, severe_cnt),
-                fontsize=fontsz,
-                ha="center",
-            )
-        moderate_pct = plotdata["Moderate"].iloc[i]
-        moderate_cnt = input_data["NUMBER moderate chronic absence"].iloc[i]
-        if moderate_pct > 0:
-            ax.text(
-                i,
-                moderate_pct + severe_pct,
-                "{0:.1%}\n{1}".format(moderate_pct, moderate_cnt),
-                fontsize=fontsz,
-                ha="center",
-            )
+    fontsz = -0.5 * len(plotdata) + 14
+    label_bars(
+        ax,
+        plotdata,
+        "{0:.1%}\n{1}",
+        fontsize=fontsz,
+        label_type="edge",
+        counts=chronic_counts(input_data),
+    )
 
     plotdata = input_data.iloc[:-1, 9]
     ax = axs[1]
-    plotdata.plot(kind="bar", ax=ax, color=["#c3d69b"])
+    plotdata.plot(kind="bar", ax=ax, color=colors_of([plotdata.name]))
     ax.grid(axis="y")
     ax.set_title(chart_titles[1])
     ax.tick_params(axis="x", labelrotation=label_rot)
@@ -561,14 +598,387 @@ def grade_race_gender_charts(input_data, chart_titles, label_rot=0):
     ax.set_ylim([ymin, ymax * 1.1])
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0, 0))
 
-    for i in range(len(plotdata)):
-        fontsz = -0.5 * len(plotdata) + 14
-        ax.text(
-            i,
-            plotdata.iloc[i],
-            "{0:.1%}\n{1}".format(
-                plotdata.iloc[i], input_data["NUMBER satisfactory attendance"].iloc[i]
-            ),
-            fontsize=fontsz,
-            ha="center",
-        )
+    label_bars(
+        ax,
+        plotdata,
+        "{0:.1%}\n{1}",
+        fontsize=fontsz,
+        label_type="edge",
+        counts=input_data.iloc[:-1].loc[:, ["NUMBER satisfactory attendance"]],
+        min_value=None,
+    )
+
+
+def gender_charts(fig, input_data, chart_titles, label_rot=0):
+    plotdata = input_data.rename(index={"M": "Male", "F": "Female"})
+    grade_race_gender_charts(fig, plotdata, chart_titles, label_rot)
+
+
+def race_gender_charts(fig, input_data, chart_titles, label_rot=0):
+    # the last row is a subtotal for the whole district
+    grade_race_gender_charts(fig, input_data.iloc[:-1, :], chart_titles, label_rot)
+
+
+# long lists (schools, zip codes, districts) are drawn as horizontal bars,
+# ROWS_PER_PAGE rows at a time
+ROWS_PER_PAGE = 25
+
+
+def page_labels(report, plotdata):
+    # what to call the picker and each page of the report's chart, which has
+    # a single page unless its rows (per_page) or days (months_per_page) are
+    # split up
+    if report not in renderers or plotdata is None:
+        return "Page", ["1"]
+    kwargs = renderers[report][2]
+    if kwargs.get("months_per_page"):
+        return "Dates", heatmap_page_labels(plotdata, kwargs["months_per_page"])
+    per_page = kwargs.get("per_page")
+    if not per_page:
+        return "Page", ["1"]
+    # the last row is the total, which isn't drawn
+    n_rows = len(plotdata) - 1
+    return "Rows", [
+        f"{first + 1}-{min(first + per_page, n_rows)}"
+        for first in range(0, max(n_rows, 1), per_page)
+    ]
+
+
+def page_count(report, plotdata):
+    return len(page_labels(report, plotdata)[1])
+
+
+def school_bar_charts(
+    fig,
+    input_data,
+    columns,
+    colors,
+    title,
+    stacked=True,
+    page=0,
+    per_page=ROWS_PER_PAGE,
+):
+    # columns maps the PERCENT columns to plot to their legend labels
+    plotdata = input_data.iloc[:-1].loc[:, list(columns)].rename(columns=columns)
+    n_rows = len(plotdata)
+    n_pages = max(1, math.ceil(n_rows / per_page))
+    page = min(max(page, 0), n_pages - 1)
+    first = page * per_page
+    plotdata = plotdata.iloc[first : first + per_page]
+    if n_pages > 1:
+        title = f"{title}\n(rows {first + 1}-{first + len(plotdata)} of {n_rows})"
+
+    ax = fig.axes[0]
+    # barh draws the first row at the bottom
+    plotdata.iloc[::-1].plot(
+        kind="barh", stacked=stacked, ax=ax, color=colors, width=0.8
+    )
+    ax.set_title(title)
+    ax.set_ylabel("")
+    ax.grid(axis="x")
+    ax.set_axisbelow(True)
+    ax.xaxis.set_major_formatter(mtick.PercentFormatter(1.0, 0))
+    ax.tick_params(axis="y", labelsize=max(6, 11 - len(plotdata) // 5))
+    ax.legend(
+        loc="upper center",
+        bbox_to_anchor=(0.5, -0.06),
+        ncols=len(columns),
+        frameon=False,
+    )
+    if not stacked:
+        xmin, xmax = ax.get_xlim()
+        ax.set_xlim([xmin, xmax * 1.1])
+
+    # segments too thin to hold a label are left without one
+    label_bars(
+        ax,
+        plotdata.iloc[::-1],
+        "{0:.0%}",
+        fontsize=max(6, 10 - len(plotdata) // 8),
+        label_type="center" if stacked else "edge",
+        min_value=0.04 if stacked else None,
+    )
+
+
+attendance_columns = {
+    "PERCENT severe chronic absence": "Severe Chronic",
+    "PERCENT moderate chronic absence": "Moderate",
+    "PERCENT at-risk attendance": "At-risk",
+    "PERCENT satisfactory attendance": "Satisfactory",
+}
+absence_columns = {
+    "PERCENT of Absences Excused": "Excused",
+    "PERCENT of Absences Unexcused": "Unexcused",
+    "PERCENT of Absences due to Suspension": "Suspension",
+}
+notification_columns = {
+    "No Notifications PERCENT": "No Notifications",
+    "Excessive Absence Letter (only) PERCENT": "Excessive Absence Letter",
+    "Notice of Truancy (only) PERCENT": "Notice of Truancy",
+    "BOTH: Excessive Absence Letter AND Notice of Truancy PERCENT": "Both",
+}
+notice_columns = {
+    "PERCENT Zero NOTs": "Zero NOTs",
+    "PERCENT One NOT": "One Notice",
+    "PERCENT Two Notices": "Two Notices",
+    "PERCENT Three or More": "Three or More Notices",
+}
+letter_columns = {"Sent Excessive Absence Letter PERCENT": "Excessive Letter Sent"}
+
+
+bygrade_titles = [
+    "What percentage of students in each grade level\nhave moderate or severe chronic absence?",
+    "What percentage of students in each grade level\nhave satisfactory attendance?",
+]
+
+# report -> (function that draws its chart, (rows, columns) of axes it draws
+# on, keyword arguments for it)
+renderers = {
+    "bygrade": (grade_race_gender_charts, (1, 2), {"chart_titles": bygrade_titles}),
+    "bygrade_prior": (
+        grade_race_gender_charts,
+        (1, 2),
+        {"chart_titles": bygrade_titles},
+    ),
+    "bygrade_two_yr_prior": (
+        grade_race_gender_charts,
+        (1, 2),
+        {"chart_titles": bygrade_titles},
+    ),
+    "bygrade3yrs": (grade_3yr_charts, (1, 1), {}),
+    "byrace": (
+        grade_race_gender_charts,
+        (1, 2),
+        {
+            "chart_titles": [
+                "What percentage of students in each race/ethnicity have\nmoderate or severe chronic absence?",
+                "What percentage of students in each race/ethnicity have\nsatisfactory attendance?",
+            ],
+            "label_rot": 90,
+        },
+    ),
+    "bygender": (
+        gender_charts,
+        (1, 2),
+        {
+            "chart_titles": [
+                "What percentage of boys and girls have moderate or severe\nchronic absence?",
+                "What percentage of boys and girls have\nsatisfactory attendance?",
+            ],
+        },
+    ),
+    "byracegender": (
+        race_gender_charts,
+        (1, 2),
+        {
+            "chart_titles": [
+                "What percentage of students have moderate or\nsevere chronic absence by race/ethnicity and gender?",
+                "What percentage of students have satisfactory\nattendance by race/ethnicity and gender?",
+            ],
+            "label_rot": 90,
+        },
+    ),
+    "byracegrade": (race_grade_charts, (1, 1), {}),
+    "byIEP": (
+        sp_eng_fre_charts,
+        (1, 2),
+        {
+            "chart_titles": [
+                "Do students with special needs have higher rates of\nmoderate or severe chronic absence?",
+                "What are the attendance patterns of students with\nspecial needs?",
+            ],
+        },
+    ),
+    "byEngLearner": (
+        sp_eng_fre_charts,
+        (1, 2),
+        {
+            "chart_titles": [
+                "Do English Learners have different rates of moderate or severe\nchronic absence than students not learning English?",
+                "What are the attendance patterns of English Learners?",
+            ],
+        },
+    ),
+    "byFreeReduced": (
+        sp_eng_fre_charts,
+        (1, 2),
+        {
+            "chart_titles": [
+                "Do students with free/reduced lunch status have higher\nrates of chronic or severe chronic absence?",
+                "What are the attendance patterns of students with\nFree/Reduced Lunch status?",
+            ],
+        },
+    ),
+    "absence_types": (absence_gender_charts, (1, 2), {}),
+    "absence_by_gender": (absence_gender_charts, (1, 2), {"label_rot": 90}),
+    "absence_by_grade": (
+        absence_grade_charts,
+        (1, 1),
+        {
+            "title": "What is the percentage of each absence type, by grade, for chronically absent, non-chronically absent and all students?",
+            "label_rot": 90,
+            "ha": "center",
+            "label_bars": False,
+        },
+    ),
+    "absence_by_race": (
+        absence_grade_charts,
+        (1, 1),
+        {
+            "title": "What is the percentage of each absence type, by ethnicity for chronically absent, non-chronically absent and students overall?",
+            "label_rot": 60,
+            "ha": "right",
+        },
+    ),
+    "absence_by_racegender": (
+        absence_grade_charts,
+        (1, 1),
+        {
+            "title": "Among chronically absent students, what is the percentage of each absence type, by race/ethnicity and gender?",
+            "label_rot": 60,
+            "ha": "right",
+        },
+    ),
+    "absence_by_racegender_not": (
+        absence_grade_charts,
+        (1, 1),
+        {
+            "title": "Among non-chronically absent students, what is the percentage of each absence type, by race/ethnicity and gender?",
+            "label_rot": 60,
+            "ha": "right",
+        },
+    ),
+    "part1_notifications": (notification_plot, (1, 1), {}),
+    "part2_notifications": (notification_plot2, (1, 1), {}),
+    "part3_notifications": (notification_plot3, (1, 1), {}),
+    "part1_grade_notifications": (notif_grade_plot, (1, 1), {}),
+    "part2_grade_notifications": (notif_grade_plot2, (1, 1), {}),
+    "part3_grade_notifications": (notif_grade_plot3, (1, 1), {}),
+    "heatmap": (heatmap_plot, (1, 2), {"months_per_page": MONTHS_PER_PAGE}),
+    "byschool": (
+        school_bar_charts,
+        (1, 1),
+        {
+            "columns": attendance_columns,
+            "colors": colors_of(attendance_columns),
+            "title": "What are the attendance patterns at each school?",
+            "per_page": ROWS_PER_PAGE,
+        },
+    ),
+    "byzipcode": (
+        school_bar_charts,
+        (1, 1),
+        {
+            "columns": attendance_columns,
+            "colors": colors_of(attendance_columns),
+            "title": "What are the attendance patterns of students in each zip code?",
+            "per_page": ROWS_PER_PAGE,
+        },
+    ),
+    "bydistrict": (
+        school_bar_charts,
+        (1, 1),
+        {
+            "columns": attendance_columns,
+            "colors": colors_of(attendance_columns),
+            "title": "What are the attendance patterns in each district?",
+            "per_page": ROWS_PER_PAGE,
+        },
+    ),
+    "by_suspension_school": (
+        school_bar_charts,
+        (1, 1),
+        {
+            "columns": {
+                "PERCENT of total students with at least one suspension": "At least one suspension",
+                "PERCENT of total students with two or more suspension": "Two or more suspensions",
+            },
+            "colors": ["#ff6d6d", "#c1504c"],
+            "title": "What percentage of students at each school were suspended?",
+            "stacked": False,
+            "per_page": ROWS_PER_PAGE,
+        },
+    ),
+    "absence_by_school": (
+        school_bar_charts,
+        (1, 1),
+        {
+            "columns": absence_columns,
+            "colors": colors_of(absence_columns),
+            "title": "What is the percentage of each absence type at each school?",
+            "per_page": ROWS_PER_PAGE,
+        },
+    ),
+    "part1_school_notifications": (
+        school_bar_charts,
+        (1, 1),
+        {
+            "columns": notification_columns,
+            "colors": colors_of(notification_columns),
+            "title": "Which notifications were chronically absent students at each school sent?",
+            "per_page": ROWS_PER_PAGE,
+        },
+    ),
+    "part2_school_notifications": (
+        school_bar_charts,
+        (1, 1),
+        {
+            "columns": notice_columns,
+            "colors": colors_of(notice_columns),
+            "title": "How many Notices of Truancy were chronically absent students at each school sent?",
+            "per_page": ROWS_PER_PAGE,
+        },
+    ),
+    "part3_school_notifications": (
+        school_bar_charts,
+        (1, 1),
+        {
+            "columns": letter_columns,
+            "colors": colors_of(letter_columns),
+            "title": "What percentage of chronically absent students at each school were sent an excessive absence letter?",
+            "stacked": False,
+            "per_page": ROWS_PER_PAGE,
+        },
+    ),
+}
+
+
+def plot_report(fig, report, plotdata, page=0):
+    # draws the chart for one report type onto fig, which has the report's
+    # layout of axes. Reports without a renderer, or without any rows, are
+    # left blank; page only applies to paged reports
+    if report not in renderers or plotdata is None or not len(plotdata):
+        return
+    renderer, _, kwargs = renderers[report]
+    if kwargs.get("per_page") or kwargs.get("months_per_page"):
+        kwargs = {**kwargs, "page": page}
+    start = time.perf_counter()
+    renderer(fig, plotdata, **kwargs)
+    logger.debug("drew %s in %.3fs", report, time.perf_counter() - start)
+
+
+@contextmanager
+def chart_figure(layout=(1, 1), style="default"):
+    # a figure with a (rows, columns) grid of axes, drawn with the given
+    # matplotlib style. It's made without pyplot, so pyplot's figure manager
+    # never holds on to it and it's freed as soon as the caller is done
+    with mplstyle.context(style):
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        fig.subplots(*layout, squeeze=False)
+        yield fig
+
+
+def render_png(report, plotdata, width, height, pixelratio=1, dark=False, page=0):
+    # renders the report's chart at the given size (in css pixels) the way
+    # shiny's render.plot would, but returns the png bytes so they can be cached
+    layout = renderers[report][1] if report in renderers else (1, 1)
+    style = "dark_background" if dark else "default"
+    with chart_figure(layout, style) as fig:
+        plot_report(fig, report, plotdata, page)
+        dpi = fig.get_dpi()
+        fig.set_size_inches(width / dpi, height / dpi)
+        fig.set_layout_engine("tight")
+        with io.BytesIO() as buf:
+            fig.savefig(buf, format="png", dpi=dpi * pixelratio)
+            return buf.getvalue()
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+from facts import (
+    COUNTY,
+    absences,
+    aggregate,
+    aggregations,
+    count_columns,
+    key_columns,
+    keyed,
+)
+
+# A snapshot with a fact table can also carry its students' attendance day by
+# day (daily.parquet), one row per student, school and school day:
+#
+#   student_id, school                         as in the fact table
+#   date                                       the school day
+#   days_enrolled, days_excused, ...           the fact table's counts for
+#                                              just that day (0 or 1, or the
+#                                              suspensions, letters and
+#                                              notices dated that day)
+#
+# A student's fact table counts are the sums of their days. Kept as running
+# totals by day, the counts over any window of days are the difference of two
+# rows, so a report for any dates is aggregated straight from them instead of
+# needing a snapshot of its own.
+
+DAILY = "daily.parquet"
+
+# reports that can be worked out for any window of days
+window_reports = [*aggregations, "heatmap"]
+
+
+def to_daily(records):
+    """The daily records in the order they're stored: by date, with the
+    smallest unsigned integers that hold each count."""
+    daily = {
+        "student_id": records["student_id"].astype("string"),
+        "school": records["school"].astype("string").astype("category"),
+        "date": pd.to_datetime(records["date"]).astype("datetime64[s]"),
+    }
+    for column in count_columns:
+        daily[column] = pd.to_numeric(records[column], downcast="unsigned")
+    return pd.DataFrame(daily).sort_values("date", kind="stable", ignore_index=True)
+
+
+def running_totals(counts, rows, days, shape):
+    # counts summed into (day + 1, row) cells, then added up down the days so
+    # row i holds the totals over the first i days
+    cells = np.bincount(
+        (days + 1) * shape[1] + rows, weights=counts, minlength=shape[0] * shape[1]
+    )
+    totals = cells.reshape(shape).cumsum(axis=0)
+    return totals.astype(np.min_scalar_type(int(totals.max(initial=0))))
+
+
+class DailyCounts:
+    """Each student's counts (count_columns) from the first school day up to
+    every later one, plus each district's, for reports over any dates.
+
+    ``facts`` is the snapshot's fact table, whose labels are used for every
+    window, and ``daily`` its daily records. Days of students that aren't in
+    the fact table are left out.
+    """
+
+    def __init__(self, facts, daily):
+        self.facts = facts.reset_index(drop=True)
+        rows = keyed(self.facts).index.get_indexer(keyed(daily, key_columns).index)
+        known = rows >= 0
+        rows = rows[known]
+        dates = daily.date.to_numpy(dtype="datetime64[D]")[known]
+        self.dates = np.unique(dates)
+        days = np.searchsorted(self.dates, dates)
+        districts = self.facts.district.cat.codes.to_numpy()[rows]
+        n_days = len(self.dates) + 1
+        n_districts = len(self.facts.district.cat.categories)
+        # [column][i] -> every student's totals over the first i days
+        self.totals = {}
+        # [column][i] -> every district's totals over the first i days
+        self.district_totals = {}
+        for column in count_columns:
+            counts = daily[column].to_numpy(dtype=float)[known]
+            self.totals[column] = running_totals(
+                counts, rows, days, (n_days, len(self.facts))
+            )
+            self.district_totals[column] = running_totals(
+                counts, districts, days, (n_days, n_districts)
+            )
+
+    def span(self):
+        # the first and last school day
+        return self.dates[0].item(), self.dates[-1].item()
+
+    def _rows(self, start, end):
+        # rows of the running totals just before start and at end
+        first = np.searchsorted(self.dates, np.datetime64(start, "D"), "left")
+        last = np.searchsorted(self.dates, np.datetime64(end, "D"), "right")
+        return first, max(first, last)
+
+    def window_facts(self, start, end):
+        """The fact table with each student's counts from start to end (both
+        included). Students not enrolled on any of those days are left out."""
+        first, last = self._rows(start, end)
+        facts = self.facts.copy()
+        for column in count_columns:
+            totals = self.totals[column]
+            facts[column] = totals[last] - totals[first]
+        return facts[facts.days_enrolled > 0]
+
+    def heatmap(self, district, start, end):
+        # absences and the share of enrolled students absent on each day
+        first, last = self._rows(start, end)
+        if district == COUNTY:
+            columns = slice(None)
+        else:
+            columns = self.facts.district.cat.categories == district
+        days = pd.DataFrame(
+            {
+                column: np.diff(
+                    self.district_totals[column][first : last + 1, columns]
+                    .sum(axis=1)
+                    .astype(np.int64)
+                )
+                for column in count_columns
+            },
+            index=pd.DatetimeIndex(self.dates[first:last]),
+        )
+        days = days[days.days_enrolled > 0]
+        combined = absences(days)
+        return pd.DataFrame(
+            {"combined": combined, "pctAbsent": combined / days.days_enrolled}
+        )
+
+    def report(self, district, report, start, end):
+        # None if no one was enrolled on any day from start to end, e.g. a
+        # weekend, since there's nothing to report
+        if report == "heatmap":
+            days = self.heatmap(district, start, end)
+            return days if len(days) else None
+        facts = self.window_facts(start, end)
+        if district != COUNTY:
+            facts = facts[facts.district == district]
+        if not len(facts):
+            return None
+        return aggregate(facts, district, report)
@@ -0,0 +1,762 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from github import Github
+
+from caching import LRUCache
+from daily import DailyCounts, window_reports
+from facts import aggregate, aggregations
+from snapshot import (
+    MANIFEST,
+    merge_daily,
+    merge_facts,
+    merge_rows,
+    read_manifest,
+    read_metadata,
+    read_partition,
+)
+
+DATASTORE_REPO = "joliphant-edcoe/attendanceWorksDatastore"
+
+logger = logging.getLogger(__name__)
+
+
+def git_blob_sha(data):
+    # the same id git (and the GitHub API) gives a file's contents
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class GithubSource:
+    """The `data` directory of the datastore repo on GitHub.
+
+    Unpickling runs whatever code the pickle says to, so legacy pickle
+    snapshots are only read from it with ``allow_pickles``.
+    """
+
+    def __init__(
+        self, token, repo_name=DATASTORE_REPO, path="data", allow_pickles=False
+    ):
+        self.token = token
+        self.repo_name = repo_name
+        self.path = path
+        self.allow_pickles = allow_pickles
+        self._repo = None
+
+    def _get_repo(self):
+        if self._repo is None:
+            self._repo = Github(self.token).get_repo(self.repo_name)
+        return self._repo
+
+    def list_files(self):
+        # {path relative to `data`: git sha}. One API call, plus one per
+        # columnar snapshot directory.
+        repo = self._get_repo()
+        files = {}
+        for c in repo.get_contents(self.path):
+            if c.type == "dir":
+                for f in repo.get_contents(c.path):
+                    files[f"{c.name}/{f.name}"] = f.sha
+            else:
+                files[c.name] = c.sha
+        return files
+
+    def read(self, name, sha):
+        blob = self._get_repo().get_git_blob(sha)
+        return base64.b64decode(blob.content)
+
+
+class LocalSource:
+    """A local directory laid out like the datastore repo's `data` directory."""
+
+    def __init__(self, root, allow_pickles=True):
+        self.root = root
+        self.allow_pickles = allow_pickles
+
+    def list_files(self):
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(self.root)
+        files = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    files[name] = git_blob_sha(f.read())
+        return files
+
+    def read(self, name, sha):
+        with open(os.path.join(self.root, name), "rb") as f:
+            return f.read()
+
+
+class DiskCache:
+    """Content-addressed local copy of the datastore.
+
+    Blobs are stored under their git sha, so revalidating only costs a listing
+    and a file is only downloaded when its sha isn't already on disk. The last
+    successful listing is kept in index.json so the app can start from it when
+    the source is unreachable.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    def _write_atomic(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load_index(self):
+        if not os.path.exists(self.index_path):
+            return None
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    def revalidate(self, source, offline=False):
+        """Return the current {name: sha} listing, falling back to the last good one."""
+        if not offline:
+            try:
+                listing = source.list_files()
+            except Exception as e:
+                logger.warning("datastore unreachable, using cached listing: %s", e)
+            else:
+                self._write_atomic(self.index_path, json.dumps(listing).encode())
+                return listing
+
+        listing = self.load_index()
+        if listing is None:
+            raise RuntimeError("datastore unreachable and no cached snapshot available")
+        return listing
+
+    def blob_path(self, sha):
+        return os.path.join(self.blob_dir, sha)
+
+    def fetch(self, source, name, sha):
+        path = self.blob_path(sha)
+        if not os.path.exists(path):
+            data = source.read(name, sha)
+            if git_blob_sha(data) != sha:
+                raise ValueError(f"{name}: downloaded content does not match sha {sha}")
+            self._write_atomic(path, data)
+        return path
+
+
+class CachedFiles:
+    """Maps the file names of one snapshot to local paths in the disk cache,
+    downloading each file the first time it is asked for."""
+
+    def __init__(self, cache, source, shas):
+        self.cache = cache
+        self.source = source
+        self.shas = shas  # {name within the snapshot: (name in the source, sha)}
+
+    def __getitem__(self, name):
+        source_name, sha = self.shas[name]
+        return self.cache.fetch(self.source, source_name, sha)
+
+    def __contains__(self, name):
+        return name in self.shas
+
+    def prefetch(self):
+        for name in self.shas:
+            self[name]
+
+    def version(self):
+        # changes whenever any file in the snapshot changes
+        shas = "".join(f"{name}:{sha}\n" for name, (_, sha) in sorted(self.shas.items()))
+        return hashlib.sha1(shas.encode()).hexdigest()
+
+
+class PickleSnapshot:
+    """Legacy monthly snapshot: one pickle holding every district and report.
+
+    Its metadata lives in an optional sidecar json file with the same stem
+    (october.pickle -> october.json), so it can be read without the pickle.
+    """
+
+    def __init__(self, files, name, metadata_name=None):
+        self.files = files
+        self.name = name
+        self.metadata_name = metadata_name
+        self.version = files.version()
+        self._data = None
+        self._metadata = None
+        self._lock = threading.Lock()
+
+    def metadata(self):
+        if self._metadata is None:
+            if self.metadata_name is None:
+                self._metadata = {}
+            else:
+                with open(self.files[self.metadata_name]) as f:
+                    self._metadata = read_metadata(f)
+        return self._metadata
+
+    def _load(self):
+        with self._lock:
+            if self._data is None:
+                with open(self.files[self.name], "rb") as f:
+                    self._data = pickle.load(f)
+        return self._data
+
+    def load_partition(self, district, report):
+        # a pickle can only be read whole, so this loads the full month once
+        data = self._data if self._data is not None else self._load()
+        return data[district][report]
+
+    def prefetch(self):
+        self.files.prefetch()
+
+
+class ColumnarSnapshot:
+    """Monthly snapshot stored as one parquet file per (district, report).
+
+    Only the manifest and the frames that are actually requested are fetched,
+    and they are memory-mapped from the disk cache. A snapshot with a student
+    fact table (see facts.py) leaves out the frames that can be aggregated
+    from it, and they are worked out when they are first requested instead.
+    With daily records as well (see daily.py), reports can be worked out for
+    any dates within the month with ``load_window``.
+
+    A delta snapshot (see snapshot.py) is read through its base, which is
+    looked up by name in ``snapshots``; open_datastore links them up.
+    """
+
+    def __init__(self, files, snapshots=None):
+        self.files = files
+        self.version = files.version()
+        self.snapshots = snapshots
+        self._manifest = None
+        self._facts = None
+        self._daily = None
+        self._dates = None
+        self._lock = threading.Lock()
+
+    def manifest(self):
+        with self._lock:
+            if self._manifest is None:
+                with open(self.files[MANIFEST]) as f:
+                    self._manifest = read_manifest(f)
+        return self._manifest
+
+    def base(self):
+        name = self.manifest().get("base")
+        if name is None:
+            return None
+        if not self.snapshots or name not in self.snapshots:
+            raise KeyError(f"base snapshot {name} is missing")
+        return self.snapshots[name]
+
+    def has_facts(self):
+        base = self.base()
+        return "facts" in self.manifest() or (
+            isinstance(base, ColumnarSnapshot) and base.has_facts()
+        )
+
+    def facts(self):
+        # a delta's facts are its base's, updated with its own rows
+        manifest = self.manifest()
+        base = self.base()
+        base_facts = base.facts() if base is not None and base.has_facts() else None
+        with self._lock:
+            if self._facts is None:
+                if "facts" not in manifest:
+                    self._facts = base_facts
+                else:
+                    facts = read_partition(self.files[manifest["facts"]])
+                    if base_facts is not None:
+                        facts = merge_facts(base_facts, facts)
+                    self._facts = facts
+        return self._facts
+
+    def has_daily(self):
+        base = self.base()
+        return self.has_facts() and (
+            "daily" in self.manifest()
+            or (isinstance(base, ColumnarSnapshot) and base.has_daily())
+        )
+
+    def daily_rows(self):
+        # a delta's days are its base's, updated with its own rows
+        manifest = self.manifest()
+        base = self.base()
+        rows = None
+        if "daily" in manifest:
+            rows = read_partition(self.files[manifest["daily"]])
+        if base is not None and base.has_daily():
+            base_rows = base.daily_rows()
+            rows = base_rows if rows is None else merge_daily(base_rows, rows)
+        return rows
+
+    def daily(self):
+        # the running totals are built once, the first time a window is asked for
+        if self._daily is None:
+            daily = DailyCounts(self.facts(), self.daily_rows())
+            with self._lock:
+                if self._daily is None:
+                    self._daily = daily
+        return self._daily
+
+    def date_span(self):
+        # the first and last school day, read without building the totals
+        if self._dates is None:
+            manifest = self.manifest()
+            base = self.base()
+            dates = []
+            if "daily" in manifest:
+                days = pd.read_parquet(self.files[manifest["daily"]], columns=["date"])
+                dates += [days.date.min().date(), days.date.max().date()]
+            if base is not None and base.has_daily():
+                dates += base.date_span()
+            self._dates = (min(dates), max(dates))
+        return self._dates
+
+    def load_window(self, district, report, start, end):
+        # the report over the days from start to end; reports that can't be
+        # split by day are the whole month's
+        if report in window_reports:
+            return self.daily().report(district, report, start, end)
+        return self.load_partition(district, report)
+
+    def load_partition(self, district, report):
+        manifest = self.manifest()
+        partitions = manifest["partitions"].get(district, {})
+        base = self.base()
+        if report in partitions:
+            filename = partitions[report]
+            if filename is None:
+                return None
+            frame = read_partition(self.files[filename])
+            if base is not None and report in manifest.get("appended", ()):
+                frame = merge_rows(base.load_partition(district, report), frame)
+            return frame
+        if report in aggregations and self.has_facts():
+            return aggregate(self.facts(), district, report)
+        if base is None:
+            raise KeyError(f"{district} {report}")
+        return base.load_partition(district, report)
+
+    def metadata(self):
+        return self.manifest().get("metadata", {})
+
+    def prefetch(self):
+        self.files.prefetch()
+        self.manifest()
+
+
+def link_deltas(snapshots):
+    # a delta's version also covers its bases, so it changes when they do
+    linked = {}
+
+    def version(name, chain=()):
+        if name in chain:
+            raise ValueError(f"snapshot {name} is its own base")
+        snapshot = snapshots[name]
+        if name not in linked and isinstance(snapshot, ColumnarSnapshot):
+            base_name = snapshot.manifest().get("base")
+            if base_name is not None:
+                snapshot.base()  # a missing base fails here
+                base_version = version(base_name, chain + (name,))
+                versions = f"{snapshot.files.version()}:{base_version}"
+                snapshot.version = hashlib.sha1(versions.encode()).hexdigest()
+        linked[name] = snapshot.version
+        return linked[name]
+
+    for snapshot in snapshots.values():
+        if isinstance(snapshot, ColumnarSnapshot):
+            snapshot.snapshots = snapshots
+    for name in list(snapshots):
+        try:
+            version(name)
+        except (KeyError, ValueError):
+            # a delta without its base can't be read; leave it out
+            logger.exception("skipping snapshot %s", name)
+            snapshots.pop(name, None)
+
+
+def open_datastore(source, cache, offline=False, previous=None):
+    # pickles at the top of the source are legacy snapshots (with an optional
+    # json sidecar), directories are columnar snapshots. Pickles are only used
+    # if the source allows them (see GithubSource) and the month hasn't been
+    # converted to a directory of the same name yet. Nothing but the listing
+    # and the manifests (to link deltas to their bases) is downloaded here.
+    # Snapshots in `previous` that haven't changed are reused as they are.
+    listing = cache.revalidate(source, offline=offline)
+    previous = {s.version: s for s in previous or ()}
+    snapshots = {}
+    dirs = {}
+    converted = {name.split("/", 1)[0] for name in listing if "/" in name}
+    for name, sha in sorted(listing.items()):
+        stem, ext = os.path.splitext(name)
+        if "/" in name:
+            dirname, filename = name.split("/", 1)
+            dirs.setdefault(dirname, {})[filename] = (name, sha)
+        elif ext in (".pickle", ".pkl"):
+            if stem in converted:
+                continue
+            if not source.allow_pickles:
+                logger.warning(
+                    "skipping pickle snapshot %s; convert it with snapshot.py "
+                    "or set DATASTORE_ALLOW_PICKLES=1",
+                    name,
+                )
+                continue
+            shas = {name: (name, sha)}
+            sidecar = stem + ".json"
+            if sidecar in listing:
+                shas[sidecar] = (sidecar, listing[sidecar])
+            snapshots[name] = PickleSnapshot(
+                CachedFiles(cache, source, shas),
+                name,
+                metadata_name=sidecar if sidecar in shas else None,
+            )
+    for dirname, shas in dirs.items():
+        if MANIFEST in shas:
+            snapshots[dirname] = ColumnarSnapshot(CachedFiles(cache, source, shas))
+    link_deltas(snapshots)
+
+    for name, snapshot in snapshots.items():
+        snapshots[name] = previous.get(snapshot.version, snapshot)
+    return {name: snapshots[name] for name in sorted(snapshots)}
+
+
+def snapshot_label(name):
+    # "october.pickle" -> "October", "school_year_2425" -> "School Year 2425"
+    return os.path.splitext(name)[0].replace("_", " ").title()
+
+
+def month_registry(snapshots):
+    """{month label: snapshot}, most recent period first.
+
+    Labels and ordering come from each snapshot's metadata; snapshots without
+    metadata fall back to a label made from their name and go last.
+    """
+    entries = []
+    for name, snapshot in snapshots.items():
+        metadata = snapshot.metadata()
+        label = metadata.get("label") or snapshot_label(name)
+        entries.append((metadata.get("period_end", ""), label, snapshot))
+    entries.sort(key=lambda e: e[0], reverse=True)
+    return {label: snapshot for _, label, snapshot in entries}
+
+
+def datastore_from_env(default_cache_dir):
+    # DATASTORE_DIR points at a local copy of the datastore's data directory
+    # (for development); otherwise the datastore repo on GitHub is used.
+    # downloads are cached on disk by git sha under DATASTORE_CACHE_DIR.
+    # legacy pickles are read from a local copy but not from GitHub, unless
+    # DATASTORE_ALLOW_PICKLES is set to 1 (or 0 to refuse them everywhere).
+    if os.getenv("DATASTORE_DIR"):
+        source = LocalSource(os.getenv("DATASTORE_DIR"))
+    else:
+        source = GithubSource(os.getenv("github_token"))
+    if os.getenv("DATASTORE_ALLOW_PICKLES"):
+        source.allow_pickles = os.getenv("DATASTORE_ALLOW_PICKLES") == "1"
+    cache = DiskCache(os.getenv("DATASTORE_CACHE_DIR", default_cache_dir))
+    return source, cache
+
+
+def interned(names):
+    # column names as one shared string each, however many frames have them
+    return pd.Index(
+        [sys.intern(name) if isinstance(name, str) else name for name in names],
+        dtype=object,
+    )
+
+
+def compact_labels(labels):
+    # labels that repeat are stored once each, as a categorical. Either way
+    # they're copied, so the new frame doesn't keep the old one's references
+    repeated = (
+        not isinstance(labels, pd.MultiIndex)
+        and pd.api.types.is_string_dtype(labels.dtype)
+        and len(labels.unique()) * 2 <= len(labels)
+    )
+    if isinstance(labels, pd.Index):
+        if repeated:
+            return pd.CategoricalIndex(labels, name=labels.name)
+        return labels.copy(deep=True)
+    return pd.Categorical(labels) if repeated else labels.copy()
+
+
+def compact_frame(df):
+    """The frame in smaller dtypes, so more months fit in a worker: integers
+    in the smallest of int16, int32 and int64 that holds them, repeated labels
+    as categoricals and the column names interned. Floats stay float64, since
+    in float32 shares that fall on a half (47/80) round the other way."""
+    if df is None:
+        return None
+    columns = []
+    for _, column in df.items():
+        dtype = column.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+            values = pd.to_numeric(column.to_numpy(), downcast="integer")
+            # int8 could wrap when a renderer adds a few columns together
+            if values.dtype.itemsize < 2:
+                values = values.astype(np.int16)
+        elif isinstance(dtype, np.dtype) and dtype.kind in "bf":
+            values = column.to_numpy()
+        else:
+            values = compact_labels(column.array)
+        columns.append(values)
+    # built afresh (copy=True) so each dtype's columns share one block
+    frame = pd.DataFrame(
+        dict(enumerate(columns)), index=compact_labels(df.index), copy=True
+    )
+    frame.columns = interned(df.columns)
+    return frame
+
+
+# marks a SharedFrames version directory whose snapshot is no longer in use
+RETIRED = ".retired"
+
+
+class SharedFrames:
+    """Report frames kept as memory-mapped files that every worker process maps.
+
+    The first process to read a frame writes each plain numeric column to its
+    own .npy file, and the index and other columns to a small parquet file.
+    Every process then builds the frame on top of read-only ``np.load(...,
+    mmap_mode="r")`` arrays. The numbers live in the OS page cache once,
+    however many uvicorn workers are running.
+
+    Workers reload new snapshots on their own schedule, so the files of a
+    snapshot one worker no longer uses may still be read by another. They are
+    only removed once they've been retired for ``grace`` seconds.
+    """
+
+    def __init__(self, root, grace=3600):
+        self.root = root
+        self.grace = grace
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, version, district, report):
+        return os.path.join(self.root, version, f"{district}__{report}")
+
+    def _is_mappable(self, series):
+        return isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf"
+
+    def _write(self, path, df):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=os.path.dirname(path))
+        columns = []
+        if df is not None:
+            for i, name in enumerate(df.columns):
+                if self._is_mappable(df.iloc[:, i]):
+                    np.save(os.path.join(tmp_path, f"{i}.npy"), df.iloc[:, i].to_numpy())
+                    columns.append([name, f"{i}.npy"])
+                else:
+                    columns.append([name, None])
+            other = [name for name, filename in columns if filename is None]
+            df[other].to_parquet(os.path.join(tmp_path, "labels.parquet"))
+        with open(os.path.join(tmp_path, "columns.json"), "w") as f:
+            json.dump(None if df is None else columns, f)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # another worker got there first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def _read(self, path):
+        with open(os.path.join(path, "columns.json")) as f:
+            columns = json.load(f)
+        if columns is None:
+            return None
+        labels = pd.read_parquet(os.path.join(path, "labels.parquet"))
+        data = {
+            name: (
+                labels[name]
+                if filename is None
+                else np.load(os.path.join(path, filename), mmap_mode="r")
+            )
+            for name, filename in columns
+        }
+        frame = pd.DataFrame(data, index=labels.index, copy=False)
+        frame.columns = interned(frame.columns)
+        return frame
+
+    def get(self, version, district, report, load):
+        path = self._path(version, district, report)
+        if not os.path.exists(path):
+            df = load()
+            if df is not None and not (
+                df.columns.is_unique and all(isinstance(c, str) for c in df.columns)
+            ):
+                # can't be laid out column by column; keep it in memory
+                return df
+            self._write(path, df)
+        try:
+            return self._read(path)
+        except FileNotFoundError:
+            # pruned by another worker in the meantime
+            return load()
+
+    def prune(self, versions):
+        # the files of snapshots no longer in use are marked retired the first
+        # time a worker reloads without them, and removed at a later reload once
+        # they've been retired for grace seconds. Processes that still have
+        # them mapped keep working (on posix) until they let go.
+        now = time.time()
+        for version in os.listdir(self.root):
+            retired = os.path.join(self.root, version, RETIRED)
+            try:
+                if version in versions:
+                    # back in use
+                    os.remove(retired)
+                elif not os.path.exists(retired):
+                    open(retired, "a").close()
+                elif now - os.path.getmtime(retired) >= self.grace:
+                    shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
+            except FileNotFoundError:
+                # not retired, or removed by another worker in the meantime
+                pass
+
+
+class DataStore:
+    """Monthly snapshots, read lazily one (district, report) frame at a time.
+
+    ``snapshots`` maps the month label shown in the app to its snapshot. Frames
+    are read with ``get(month, district, report)`` and kept once loaded, so
+    resident memory follows what sessions actually look at. With ``shared``
+    (a SharedFrames), frames are memory-mapped and shared between processes.
+    ``replace`` swaps in a new set of snapshots while the app is running;
+    ``version`` goes up and the ``on_replace`` listeners are called every time
+    it does.
+
+    Months with daily records can also be read for any window of dates within
+    them, ``get(month, district, report, (start, end))``. Those frames are kept
+    in an LRU cache of ``window_bytes``.
+    """
+
+    def __init__(self, snapshots, shared=None, window_bytes=64 * 2**20):
+        self._snapshots = dict(snapshots)
+        self._frames = {}
+        self.shared = shared
+        self._windows = LRUCache(
+            window_bytes, sizeof=lambda df: int(df.memory_usage(deep=True).sum())
+        )
+        self._listeners = []
+        if shared is not None:
+            self.on_replace(shared.prune)
+        self.on_replace(
+            lambda versions: self._windows.discard(lambda key: key[0] not in versions)
+        )
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def months(self):
+        return list(self._snapshots)
+
+    def __contains__(self, month):
+        return month in self._snapshots
+
+    def snapshots(self):
+        return dict(self._snapshots)
+
+    def metadata(self, month):
+        return self._snapshots[month].metadata()
+
+    def version_of(self, month):
+        return self._snapshots[month].version
+
+    def on_replace(self, listener):
+        # listener(versions) is called with the versions of the snapshots
+        # still in use after every replace, so caches can drop the rest
+        self._listeners.append(listener)
+
+    def date_span(self, month):
+        # (first, last) school day of a month that can be read for any dates
+        # in between, otherwise None
+        snapshot = self._snapshots[month]
+        if not (isinstance(snapshot, ColumnarSnapshot) and snapshot.has_daily()):
+            return None
+        return snapshot.date_span()
+
+    def get(self, month, district, report, window=None):
+        snapshot = self._snapshots[month]
+        if window is not None and report in window_reports:
+            return self._windows.get_or_compute(
+                (snapshot.version, district, report, *window),
+                lambda: compact_frame(
+                    snapshot.load_window(district, report, *window)
+                ),
+            )
+        key = (snapshot.version, district, report)
+        if key not in self._frames:
+            # frames are compacted (see compact_frame) before they're kept
+            if self.shared is None:
+                frame = compact_frame(snapshot.load_partition(district, report))
+            else:
+                frame = self.shared.get(
+                    snapshot.version,
+                    district,
+                    report,
+                    lambda: compact_frame(snapshot.load_partition(district, report)),
+                )
+            with self._lock:
+                self._frames.setdefault(key, frame)
+        return self._frames[key]
+
+    def replace(self, snapshots):
+        with self._lock:
+            versions = {s.version for s in snapshots.values()}
+            self._frames = {k: v for k, v in self._frames.items() if k[0] in versions}
+            # readers see either the old or the new dict, never a partial one
+            self._snapshots = dict(snapshots)
+            self.version += 1
+        for listener in self._listeners:
+            listener(versions)
+
+
+class DatastoreWatcher(threading.Thread):
+    """Polls the datastore in the background and swaps new or changed months
+    into ``store``.
+
+    New snapshots are downloaded into the disk cache before they are swapped
+    in, so no session has to wait on the network for them.
+    """
+
+    def __init__(self, store, source, cache, interval):
+        super().__init__(daemon=True, name="datastore-watcher")
+        self.store = store
+        self.source = source
+        self.cache = cache
+        self.interval = interval
+
+    def check(self):
+        current = self.store.snapshots()
+        snapshots = open_datastore(
+            self.source, self.cache, previous=current.values()
+        )
+        snapshots = month_registry(snapshots)
+        if snapshots == current and list(snapshots) == list(current):
+            return False
+        for snapshot in snapshots.values():
+            if snapshot not in current.values():
+                snapshot.prefetch()
+        self.store.replace(snapshots)
+        logger.info("datastore reloaded: %s", ", ".join(snapshots))
+        return True
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+            except Exception:
+                logger.exception("datastore reload failed")
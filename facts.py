@@ -0,0 +1,457 @@
+import numpy as np
+import pandas as pd
+
+from utils import districts
+
+# A snapshot can carry its students as one fact table (facts.parquet) instead
+# of a precomputed frame for every (district, report). Each row is one
+# student's enrollment at a school over the snapshot's period:
+#
+#   student_id                                 text
+#   district, school, grade, race, gender, iep, english_learner,
+#   free_reduced_lunch, zip_code              labels, stored as categoricals
+#   days_enrolled, days_excused, days_unexcused, days_suspended, suspensions,
+#   absence_letters, truancy_notices           counts
+#
+# district is the district's key (as in utils.districts) and the yes/no
+# columns hold "Yes" or "No". A row is one student (key_columns) at one
+# school; student_id is only needed by snapshot deltas, which update rows.
+# Report frames are aggregated from the table the first time they're asked
+# for, in the same layout as the precomputed ones.
+
+FACTS = "facts.parquet"
+
+# the district key that stands for every district together
+COUNTY = "all_county"
+
+# labels are reported in this order; ones not listed follow in sorted order
+category_orders = {
+    "district": [key for key in districts.values() if key != COUNTY],
+    "school": [],
+    "grade": ["TK", "K"] + [str(grade) for grade in range(1, 13)],
+    "race": ["Asian", "Black", "Hispanic", "White", "Two or More", "Other"],
+    "gender": ["M", "F"],
+    "iep": ["Yes", "No"],
+    "english_learner": ["Yes", "No"],
+    "free_reduced_lunch": ["Yes", "No"],
+    "zip_code": [],
+}
+
+key_columns = ["student_id", "school"]
+
+count_columns = [
+    "days_enrolled",
+    "days_excused",
+    "days_unexcused",
+    "days_suspended",
+    "suspensions",
+    "absence_letters",
+    "truancy_notices",
+]
+
+# share of enrolled days missed at which a student's attendance is at-risk,
+# moderately chronic and severely chronic
+AT_RISK = 0.05
+CHRONIC = 0.10
+SEVERE = 0.20
+
+
+def to_facts(records):
+    """The student records as a fact table: a categorical for each label
+    column and the smallest unsigned integers that hold each count."""
+    facts = {}
+    if "student_id" in records:
+        facts["student_id"] = records["student_id"].astype("string")
+    for column, order in category_orders.items():
+        values = records[column].astype("string")
+        seen = set(values.dropna().unique())
+        categories = [c for c in order if c in seen] + sorted(seen.difference(order))
+        facts[column] = pd.Categorical(values, categories=categories)
+    for column in count_columns:
+        facts[column] = pd.to_numeric(records[column], downcast="unsigned")
+    return pd.DataFrame(facts)
+
+
+def keyed(facts, columns=key_columns):
+    # the rows indexed by their key (as text)
+    return facts.set_index(
+        pd.MultiIndex.from_frame(facts[columns].astype(str)), drop=False
+    )
+
+
+def absences(facts):
+    # suspensions count as days missed
+    return (
+        facts.days_excused.astype(np.int64)
+        + facts.days_unexcused.astype(np.int64)
+        + facts.days_suspended.astype(np.int64)
+    )
+
+
+def absence_rate(facts):
+    enrolled = facts.days_enrolled.to_numpy(dtype=float)
+    return np.divide(
+        absences(facts).to_numpy(dtype=float),
+        enrolled,
+        out=np.zeros(len(facts)),
+        where=enrolled > 0,
+    )
+
+
+def is_chronic(facts):
+    return pd.Series(absence_rate(facts) >= CHRONIC, index=facts.index)
+
+
+def ratio(numbers, totals):
+    # numbers as a share of totals, 0 where there's nothing to share
+    return (numbers / totals.where(totals > 0)).fillna(0.0)
+
+
+def group_sums(values, keys, total="Total", join=True):
+    """Sums of values' columns for each group of keys (categoricals, so the
+    groups come in their categories' order), with a total row at the end
+    unless total is None. Groups of several keys are labelled "key1 key2"
+    unless join is False."""
+    sums = values.groupby(keys, observed=True).sum()
+    if len(keys) == 1:
+        sums.index = sums.index.astype(str).rename(None)
+    elif join:
+        sums.index = [" ".join(map(str, group)) for group in sums.index]
+    else:
+        sums.index = pd.MultiIndex.from_tuples(
+            [tuple(map(str, group)) for group in sums.index],
+            names=[key.name for key in keys],
+        )
+    if total is not None:
+        sums.loc[total] = values.sum()
+    return sums
+
+
+def labelled(values, labels):
+    # boolean values as a categorical of (label for True, label for False)
+    return pd.Series(
+        pd.Categorical(np.where(values, *labels), categories=list(labels)),
+        index=values.index,
+        name="status",
+    )
+
+
+attendance_bands = [
+    "severe chronic absence",
+    "moderate chronic absence",
+    "ALL chronic absence (severe + moderate)",
+    "at-risk attendance",
+    "satisfactory attendance",
+]
+
+
+def band_indicators(facts):
+    rate = absence_rate(facts)
+    bands = pd.DataFrame(
+        {
+            "severe chronic absence": rate >= SEVERE,
+            "moderate chronic absence": (rate >= CHRONIC) & (rate < SEVERE),
+            "ALL chronic absence (severe + moderate)": rate >= CHRONIC,
+            "at-risk attendance": (rate >= AT_RISK) & (rate < CHRONIC),
+            "satisfactory attendance": rate < AT_RISK,
+        },
+        index=facts.index,
+    )
+    return bands.astype(np.int64)
+
+
+def band_columns(sums):
+    # NUMBER and PERCENT of students in each attendance band
+    students = sums[attendance_bands[2:]].sum(axis=1)
+    table = {}
+    for band in attendance_bands:
+        table[f"NUMBER {band}"] = sums[band]
+        table[f"PERCENT {band}"] = ratio(sums[band], students)
+    return table
+
+
+def attendance_table(facts, by, total="Total", join=True):
+    keys = [facts[column] for column in by]
+    sums = group_sums(band_indicators(facts), keys, total, join)
+    return pd.DataFrame(band_columns(sums))
+
+
+def school_table(facts):
+    values = band_indicators(facts)
+    values["attended"] = facts.days_enrolled.astype(np.int64) - absences(facts)
+    values["enrolled"] = facts.days_enrolled.astype(np.int64)
+    values["lunch"] = (facts.free_reduced_lunch == "Yes").astype(np.int64)
+    values["students"] = 1
+    sums = group_sums(values, [facts.school])
+    return pd.DataFrame(
+        {
+            "Average Daily Attendance (ADA)": ratio(sums.attended, sums.enrolled),
+            "PERCENT of Students Receiving Free/Reduced Lunch": ratio(
+                sums.lunch, sums.students
+            ),
+            **band_columns(sums),
+        }
+    )
+
+
+def district_table(facts):
+    table = attendance_table(facts, ["district"])
+    # keys -> the names the app shows
+    names = {key: name for name, key in districts.items()}
+    table.index = [names.get(key, key) for key in table.index]
+    return table
+
+
+def suspension_table(facts):
+    values = pd.DataFrame(
+        {
+            "students": 1,
+            "one": facts.suspensions >= 1,
+            "two": facts.suspensions >= 2,
+            "incidents": facts.suspensions,
+            "chronic": is_chronic(facts),
+        },
+        index=facts.index,
+    ).astype(np.int64)
+    sums = group_sums(values, [facts.school])
+    return pd.DataFrame(
+        {
+            "NUMBER of students with at least one suspension": sums.one,
+            "PERCENT of total students with at least one suspension": ratio(
+                sums.one, sums.students
+            ),
+            "NUMBER of students with two or more suspensions": sums.two,
+            "PERCENT of total students with two or more suspension": ratio(
+                sums.two, sums.students
+            ),
+            "Total number of incidents of suspension": sums.incidents,
+            "Percent of School Chronically Absent": ratio(
+                sums.chronic, sums.students
+            ),
+        }
+    )
+
+
+def absence_counts(facts):
+    return pd.DataFrame(
+        {
+            "Total Absences": absences(facts),
+            "NUMBER of Excused Absences": facts.days_excused.astype(np.int64),
+            "NUMBER of Unexcused Absences": facts.days_unexcused.astype(np.int64),
+            "NUMBER of Days Suspended": facts.days_suspended.astype(np.int64),
+        },
+        index=facts.index,
+    )
+
+
+def absence_table(
+    facts, by=(), status=None, status_first=False, chronic=None, total=None
+):
+    """Days missed for each group of the by columns, split by excused,
+    unexcused and suspended. status gives labels for (chronically absent,
+    not) to group students by as well, after the by columns unless
+    status_first. chronic picks out just the chronically absent students
+    (True) or the rest (False)."""
+    if chronic is not None:
+        facts = facts[is_chronic(facts) == chronic]
+    keys = [facts[column] for column in by]
+    if status is not None:
+        labels = labelled(is_chronic(facts), status)
+        keys = [labels] + keys if status_first else keys + [labels]
+    sums = group_sums(absence_counts(facts), keys, total)
+    total_absences = sums["Total Absences"]
+    return pd.DataFrame(
+        {
+            "Total Absences": total_absences,
+            "NUMBER of Excused Absences": sums["NUMBER of Excused Absences"],
+            "PERCENT of Absences Excused": ratio(
+                sums["NUMBER of Excused Absences"], total_absences
+            ),
+            "NUMBER of Unexcused Absences": sums["NUMBER of Unexcused Absences"],
+            "PERCENT of Absences Unexcused": ratio(
+                sums["NUMBER of Unexcused Absences"], total_absences
+            ),
+            "NUMBER of Days Suspended": sums["NUMBER of Days Suspended"],
+            "PERCENT of Absences due to Suspension": ratio(
+                sums["NUMBER of Days Suspended"], total_absences
+            ),
+        }
+    )
+
+
+def notification_indicators(facts):
+    chronic = is_chronic(facts)
+    letter = facts.absence_letters > 0
+    notices = facts.truancy_notices
+    return pd.DataFrame(
+        {
+            "Total Students": True,
+            "Chronically Absent": chronic,
+            "No Notifications": chronic & ~letter & (notices == 0),
+            "Excessive Absence Letter (only)": chronic & letter & (notices == 0),
+            "Notice of Truancy (only)": chronic & ~letter & (notices > 0),
+            "BOTH: Excessive Absence Letter AND Notice of Truancy": chronic
+            & letter
+            & (notices > 0),
+            "Zero NOTs": chronic & (notices == 0),
+            "One Notices": chronic & (notices == 1),
+            "Two Notices": chronic & (notices == 2),
+            "Three or More Notices": chronic & (notices >= 3),
+            "Not Sent": chronic & ~letter,
+            "Sent Excessive Absence Letter": chronic & letter,
+        },
+        index=facts.index,
+    ).astype(np.int64)
+
+
+# (count, its column, the column of its share of the chronically absent)
+letters_and_notices = [
+    ("Total Students", "Total Students", None),
+    ("Chronically Absent", "Chronically Absent", None),
+    ("No Notifications", "No Notifications", "No Notifications PERCENT"),
+    (
+        "Excessive Absence Letter (only)",
+        "Excessive Absence Letter (only)",
+        "Excessive Absence Letter (only) PERCENT",
+    ),
+    (
+        "Notice of Truancy (only)",
+        "Notice of Truancy (only)",
+        "Notice of Truancy (only) PERCENT",
+    ),
+    (
+        "BOTH: Excessive Absence Letter AND Notice of Truancy",
+        "BOTH: Excessive Absence Letter AND Notice of Truancy",
+        "BOTH: Excessive Absence Letter AND Notice of Truancy PERCENT",
+    ),
+]
+notice_counts = [
+    ("Chronically Absent", "Chronically Absent", None),
+    ("Zero NOTs", "Zero NOTs", "PERCENT Zero NOTs"),
+    ("One Notices", "One Notices", "PERCENT One NOT"),
+    ("Two Notices", "Two Notices", "PERCENT Two Notices"),
+    ("Three or More Notices", "Three or More Notices", "PERCENT Three or More"),
+]
+letters_sent = [
+    ("Chronically Absent", "Chronically Absent", None),
+    (
+        "Sent Excessive Absence Letter",
+        "Sent Excessive Absence Letter",
+        "Sent Excessive Absence Letter PERCENT",
+    ),
+]
+
+letters_not_sent = ("Not Sent", "Not Sent", "Not Sent PERCENT")
+
+
+def notification_table(facts, layout, by=()):
+    # one row per group of the by columns and a total, or just the total
+    values = notification_indicators(facts)
+    if by:
+        sums = group_sums(values, [facts[column] for column in by])
+    else:
+        sums = values.sum().to_frame("Total").T
+    table = {}
+    for count, column, percent in layout:
+        table[column] = sums[count]
+        if percent is not None:
+            table[percent] = ratio(sums[count], sums["Chronically Absent"])
+    return pd.DataFrame(table)
+
+
+chronic_status = ("Chronically Absent", "Not Chronically Absent")
+
+# report -> (function of the district's facts, keyword arguments)
+aggregations = {
+    "bygrade": (attendance_table, {"by": ["grade"]}),
+    "byschool": (school_table, {}),
+    "byrace": (attendance_table, {"by": ["race"]}),
+    "bygender": (attendance_table, {"by": ["gender"]}),
+    "byracegender": (attendance_table, {"by": ["race", "gender"]}),
+    "byracegrade": (
+        attendance_table,
+        {"by": ["race", "grade"], "total": None, "join": False},
+    ),
+    "byIEP": (attendance_table, {"by": ["iep"]}),
+    "byEngLearner": (attendance_table, {"by": ["english_learner"]}),
+    "byFreeReduced": (attendance_table, {"by": ["free_reduced_lunch"]}),
+    "byzipcode": (attendance_table, {"by": ["zip_code"]}),
+    "bydistrict": (district_table, {}),
+    "by_suspension_school": (suspension_table, {}),
+    "absence_types": (
+        absence_table,
+        {
+            "status": (
+                "Chronically Absent Students",
+                "Non-chronically Absent Students",
+            ),
+            "total": "All Students",
+        },
+    ),
+    "absence_by_school": (absence_table, {"by": ["school"], "total": "Total"}),
+    "absence_by_gender": (
+        absence_table,
+        {
+            "by": ["gender"],
+            "status": ("Chronically Absent", "Not Chronic"),
+            "status_first": True,
+        },
+    ),
+    "absence_by_grade": (absence_table, {"by": ["grade"], "status": chronic_status}),
+    "absence_by_race": (absence_table, {"by": ["race"], "status": chronic_status}),
+    "absence_by_racegender": (
+        absence_table,
+        {"by": ["race", "gender"], "chronic": True},
+    ),
+    "absence_by_racegender_not": (
+        absence_table,
+        {"by": ["race", "gender"], "chronic": False},
+    ),
+    "part1_notifications": (notification_table, {"layout": letters_and_notices}),
+    "part2_notifications": (notification_table, {"layout": notice_counts}),
+    "part3_notifications": (
+        notification_table,
+        {"layout": [letters_sent[0], letters_not_sent, letters_sent[1]]},
+    ),
+    "part1_grade_notifications": (
+        notification_table,
+        {"layout": letters_and_notices, "by": ["grade"]},
+    ),
+    "part2_grade_notifications": (
+        notification_table,
+        {
+            "layout": [("Total Students", "Grade Total", None), *notice_counts],
+            "by": ["grade"],
+        },
+    ),
+    "part3_grade_notifications": (
+        notification_table,
+        {"layout": letters_sent, "by": ["grade"]},
+    ),
+    "part1_school_notifications": (
+        notification_table,
+        {"layout": letters_and_notices, "by": ["school"]},
+    ),
+    "part2_school_notifications": (
+        notification_table,
+        {
+            "layout": [("Total Students", "School Total", None), *notice_counts],
+            "by": ["school"],
+        },
+    ),
+    "part3_school_notifications": (
+        notification_table,
+        {"layout": letters_sent, "by": ["school"]},
+    ),
+}
+
+
+def aggregate(facts, district, report):
+    """The report's frame for the district, worked out from the fact table of
+    every district. Reports that can't be made from it (by day or from prior
+    years) aren't in ``aggregations``."""
+    function, kwargs = aggregations[report]
+    if district != COUNTY:
+        # a district only sees its own students, bydistrict included
+        facts = facts[facts.district == district]
+    return function(facts, **kwargs)
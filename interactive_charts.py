@@ -0,0 +1,526 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+import chart_plotting as cp
+
+# Vega-Lite specs for the interactive chart mode. The server only sends the
+# numbers behind a report's chart; the browser draws it (see
+# www/interactive_charts.js), so resizing, switching dark mode and hovering
+# for details cost the server nothing. chart_plotting stays the static path
+# used for the png charts and prerender.py.
+#
+# Each spec builder mirrors the chart_plotting function it stands in for and
+# takes the same keyword arguments from chart_plotting.renderers, so titles,
+# colors and columns are only defined once. Arguments that only make sense
+# for a png (label sizes) are ignored; charts split into pages are paged the
+# same way, so the page picker works for both.
+
+SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+
+def _titled(spec, text):
+    # vega-lite takes multi-line titles as a list of lines
+    if text:
+        spec["title"] = text.split("\n")
+    return spec
+
+
+def _to_records(frame):
+    # json has no NaN, so missing numbers are sent as null
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def _records(plotdata, columns, counts=None):
+    # one record per (row, series) of a frame with one column per series
+    labels = list(columns.values())
+    values = plotdata.loc[:, list(columns)].to_numpy(dtype=float)
+    n_rows = len(plotdata)
+    records = pd.DataFrame(
+        {
+            "row": np.tile(plotdata.index.astype(str).to_numpy(), len(labels)),
+            "series": np.repeat(labels, n_rows),
+            "order": np.repeat(np.arange(len(labels)), n_rows),
+            "value": values.ravel("F").round(4),
+        }
+    )
+    if counts is not None:
+        records["count"] = np.asarray(counts).ravel("F")
+    return _to_records(records)
+
+
+def _bars(
+    plotdata,
+    columns,
+    colors,
+    title=None,
+    stacked=True,
+    horizontal=False,
+    counts=None,
+    label_rot=0,
+    fmt=".1%",
+):
+    rows = plotdata.index.astype(str).tolist()
+    labels = list(columns.values())
+    category = {
+        "field": "row",
+        "type": "nominal",
+        "sort": rows,
+        "title": None,
+        "axis": {"labelAngle": -label_rot, "labelLimit": 200},
+    }
+    value = {
+        "field": "value",
+        "type": "quantitative",
+        "stack": "zero" if stacked else None,
+        "title": None,
+        "axis": {"format": fmt.replace(".1", ".0"), "grid": True},
+    }
+    tooltip = [
+        {"field": "row", "title": " "},
+        {"field": "series", "title": " "},
+        {"field": "value", "format": fmt, "title": " "},
+    ]
+    if counts is not None:
+        tooltip.append({"field": "count", "title": "Students"})
+    encoding = {
+        "color": {
+            "field": "series",
+            "type": "nominal",
+            "sort": labels,
+            "scale": {"domain": labels, "range": list(colors)},
+            "legend": {"orient": "top", "title": None},
+        },
+        "order": {"field": "order"},
+        "tooltip": tooltip,
+    }
+    if horizontal:
+        encoding.update(y=category, x=value)
+        if not stacked:
+            encoding["yOffset"] = {"field": "series", "sort": labels}
+        size = {"height": {"step": 24 if stacked else 14}}
+    else:
+        encoding.update(x=category, y=value)
+        if not stacked:
+            encoding["xOffset"] = {"field": "series", "sort": labels}
+        size = {"height": 450}
+    spec = {
+        "data": {"values": _records(plotdata, columns, counts)},
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": encoding,
+        **size,
+    }
+    return _titled(spec, title)
+
+
+def _pie(values, keys, colors, title=None):
+    spec = {
+        "data": {
+            "values": [
+                {
+                    "series": key,
+                    "order": i,
+                    "value": None if pd.isna(v) else round(float(v), 4),
+                }
+                for i, (key, v) in enumerate(zip(keys, values))
+            ]
+        },
+        "transform": [
+            {"joinaggregate": [{"op": "sum", "field": "value", "as": "total"}]},
+            {"calculate": "datum.value / datum.total", "as": "share"},
+        ],
+        "mark": {"type": "arc", "tooltip": True},
+        "encoding": {
+            "theta": {"field": "value", "type": "quantitative"},
+            "color": {
+                "field": "series",
+                "type": "nominal",
+                "sort": list(keys),
+                "scale": {"domain": list(keys), "range": list(colors)},
+                "legend": {"orient": "right", "title": None},
+            },
+            "order": {"field": "order"},
+            "tooltip": [
+                {"field": "series", "title": " "},
+                {"field": "share", "format": ".1%", "title": " "},
+            ],
+        },
+        "height": 400,
+    }
+    return _titled(spec, title)
+
+
+# side by side charts each keep their own colors and legend
+independent = {
+    "scale": {"color": "independent"},
+    "legend": {"color": "independent"},
+}
+
+
+def _hconcat(*charts, title=None):
+    return _titled({"hconcat": list(charts), "resolve": independent}, title)
+
+
+chronic_columns = {
+    "PERCENT severe chronic absence": "Severe Chronic",
+    "PERCENT moderate chronic absence": "Moderate",
+}
+
+
+def attendance_spec(input_data, chart_titles, label_rot=0):
+    # grade_race_gender_charts
+    plotdata = input_data.iloc[:-1]
+    return _hconcat(
+        _bars(
+            plotdata,
+            chronic_columns,
+            cp.colors_of(chronic_columns),
+            chart_titles[0],
+            counts=cp.chronic_counts(input_data),
+            label_rot=label_rot,
+        ),
+        _bars(
+            plotdata,
+            {"PERCENT satisfactory attendance": "Satisfactory"},
+            cp.colors_of(["PERCENT satisfactory attendance"]),
+            chart_titles[1],
+            counts=plotdata.loc[:, ["NUMBER satisfactory attendance"]],
+            label_rot=label_rot,
+        ),
+    )
+
+
+def gender_spec(input_data, chart_titles, label_rot=0):
+    plotdata = input_data.rename(index={"M": "Male", "F": "Female"})
+    return attendance_spec(plotdata, chart_titles, label_rot)
+
+
+def race_gender_spec(input_data, chart_titles, label_rot=0):
+    return attendance_spec(input_data.iloc[:-1, :], chart_titles, label_rot)
+
+
+def sp_eng_fre_spec(input_data, chart_titles, label_rot=0):
+    return _hconcat(
+        _bars(
+            input_data.iloc[:-1],
+            chronic_columns,
+            cp.colors_of(chronic_columns),
+            chart_titles[0],
+            counts=cp.chronic_counts(input_data),
+            label_rot=label_rot,
+        ),
+        _pie(
+            input_data.iloc[0, [4, 6, 8]].tolist(),
+            ["ALL chronic absence", "At-risk attendance", "Satisfactory attendance"],
+            cp.colors_of(input_data.columns[[4, 6, 8]]),
+            chart_titles[1],
+        ),
+    )
+
+
+def grade_3yr_spec(input_data):
+    rows = len(input_data)
+    plotdata = pd.concat(
+        [
+            input_data.iloc[2 * rows // 3 :, 5].rename("2022-23"),
+            input_data.iloc[rows // 3 : 2 * rows // 3, 5].rename("2023-24"),
+            input_data.iloc[: rows // 3, 5].rename("2024-25"),
+        ],
+        axis=1,
+    ).iloc[:-1]
+    return _bars(
+        plotdata,
+        {year: year for year in plotdata.columns},
+        ["#d9aca9", "#c1504c", "#9e403e"],
+        "Percentage of Students with Moderate or Severe Chronic Absence Over Time, by Grade Level",
+        stacked=False,
+    )
+
+
+def race_grade_spec(input_data):
+    plotdata = (
+        input_data.loc[:, ["PERCENT ALL chronic absence (severe + moderate)"]]
+        .swaplevel()
+        .unstack()
+        .droplevel(0, axis=1)
+    )
+    spec = _bars(
+        plotdata,
+        {race: str(race) for race in plotdata.columns},
+        ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b"],
+        "What percentage of students are chronically absent by race/ethnicity and grade?",
+    )
+    spec["mark"] = {"type": "line", "point": True, "tooltip": True}
+    spec["encoding"]["y"]["stack"] = None
+    return spec
+
+
+absence_columns = cp.absence_columns
+absence_colors = cp.colors_of(absence_columns)
+
+
+def absence_gender_spec(input_data, label_rot=0):
+    plotdata = input_data.rename(
+        index={
+            "Chronically Absent Students": "Chronically Absent",
+            "Non-chronically Absent Students": "Non-chronically Absent",
+        }
+    )
+    return _hconcat(
+        _bars(plotdata, absence_columns, absence_colors, label_rot=label_rot),
+        _bars(
+            plotdata,
+            {
+                "NUMBER of Excused Absences": "Excused",
+                "NUMBER of Unexcused Absences": "Unexcused",
+                "NUMBER of Days Suspended": "Suspension",
+            },
+            absence_colors,
+            label_rot=label_rot,
+            fmt=",d",
+        ),
+        title="How does the breakdown of absences differ based on whether students were chronically absent or not?",
+    )
+
+
+def absence_grade_spec(input_data, title, label_rot=0, ha="center", label_bars=True):
+    plotdata = input_data.rename(
+        index={
+            "Chronically Absent": "Chronic",
+            "Not Chronically Absent": "Non-chronic",
+        }
+    )
+    return _bars(plotdata, absence_columns, absence_colors, title, label_rot=label_rot)
+
+
+def notification_spec(input_data):
+    return _pie(
+        input_data.iloc[0, [2, 4, 6, 8]].tolist(),
+        [
+            "No Notifications",
+            "Excessive Absence Letter",
+            "Notice of Truancy",
+            "BOTH Excessive Letter and Notice of Truancy",
+        ],
+        cp.colors_of(input_data.columns[[2, 4, 6, 8]]),
+    )
+
+
+def notification_spec2(input_data):
+    return _pie(
+        input_data.iloc[0, [1, 3, 5, 7]].tolist(),
+        ["Zero NOTs", "One Notice", "Two Notices", "Three or More Notices"],
+        cp.colors_of(input_data.columns[[1, 3, 5, 7]]),
+        "What percentage of chronically absent students were sent Notices of Truancy?",
+    )
+
+
+def notification_spec3(input_data):
+    return _pie(
+        input_data.iloc[0, [1, 3]].tolist(),
+        ["No Excessive Letter", "Excessive Letter Sent"],
+        ["#fcd5b5", "#e46c0a"],
+        "What percentage of chronically absent students were sent an excessive absence letter?",
+    )
+
+
+def notif_grade_spec(input_data):
+    plotdata = input_data.iloc[:-1]
+    return _bars(
+        plotdata, cp.notification_columns, cp.colors_of(cp.notification_columns)
+    )
+
+
+def notif_grade_spec2(input_data):
+    plotdata = input_data.iloc[:-1]
+    columns = {
+        "PERCENT Zero NOTs": "Zero NOTs",
+        "PERCENT One NOT": "One Notice",
+        "PERCENT Two Notices": "Two Notices",
+        "PERCENT Three or More": "Three or More",
+    }
+    return _bars(plotdata, columns, cp.colors_of(columns))
+
+
+def notif_grade_spec3(input_data):
+    plotdata = input_data.iloc[:-1]
+    return _bars(
+        plotdata,
+        {plotdata.columns[2]: "Excessive Absence Letter"},
+        cp.colors_of([plotdata.columns[2]]),
+    )
+
+
+def school_spec(
+    input_data, columns, colors, title, stacked=True, page=0, per_page=cp.ROWS_PER_PAGE
+):
+    plotdata = input_data.iloc[:-1]
+    n_rows = len(plotdata)
+    if n_rows > per_page:
+        first = min(max(page, 0), (n_rows - 1) // per_page) * per_page
+        plotdata = plotdata.iloc[first : first + per_page]
+        title = f"{title}\n(rows {first + 1}-{first + len(plotdata)} of {n_rows})"
+    return _bars(
+        plotdata,
+        columns,
+        colors,
+        title,
+        stacked=stacked,
+        horizontal=True,
+        fmt=".0%",
+    )
+
+
+def weekly_spec(plotdata):
+    # heatmap_plot's overview: a row per school year, a cell per week
+    weekly = cp.weekly_totals(plotdata)
+    rows, cols, first_year = cp.school_year_index(weekly.index)
+    years = first_year + rows
+    weeks = _to_records(
+        pd.DataFrame(
+            {
+                "year": [f"{year}-{(year + 1) % 100:02d}" for year in years],
+                "week": cols,
+                "week_of": weekly.index.strftime("%b %d, %Y"),
+                "absences": weekly.combined.to_numpy(),
+                "pct": weekly.pctAbsent.to_numpy().round(4),
+            }
+        )
+    )
+
+    def calendar(field, title, fmt):
+        return {
+            "title": title,
+            "mark": {"type": "rect", "tooltip": True},
+            "encoding": {
+                "x": {
+                    "field": "week",
+                    "type": "ordinal",
+                    "scale": {"domain": list(range(cp.WEEKS_PER_YEAR))},
+                    "title": "Weeks since July",
+                    "axis": {"labels": False, "ticks": False},
+                },
+                "y": {"field": "year", "type": "ordinal", "title": None},
+                "color": {
+                    "field": field,
+                    "type": "quantitative",
+                    "scale": {"scheme": "viridis"},
+                    "legend": {"format": fmt, "title": None},
+                },
+                "tooltip": [
+                    {"field": "week_of", "title": "Week of"},
+                    {"field": field, "format": fmt, "title": " "},
+                ],
+            },
+            "height": {"step": 24},
+        }
+
+    return {
+        "data": {"values": weeks},
+        "resolve": independent,
+        "vconcat": [
+            calendar("absences", "Total Absences Per Week", ",d"),
+            calendar("pct", "Average % Absent Per Week", ".0%"),
+        ],
+    }
+
+
+def heatmap_spec(plotdata, page=0, months_per_page=cp.MONTHS_PER_PAGE):
+    # the same pages as heatmap_plot: a weekly overview, then a window of
+    # months of days per page, when there's too much for one page
+    days = cp.heatmap_page(plotdata, page, months_per_page)
+    if days is None:
+        return weekly_spec(plotdata)
+    plotdata = days
+    dates = pd.to_datetime(plotdata.index)
+    week, _ = cp.calendar_index(dates)
+    mondays = dates.normalize() - pd.to_timedelta(dates.weekday, unit="D")
+    days = _to_records(
+        pd.DataFrame(
+            {
+                "date": dates.strftime("%a %b %d, %Y"),
+                "week": week,
+                "week_of": mondays.strftime("%b %d"),
+                "weekday": np.array(["M", "T", "W", "R", "F", "S", "S"])[dates.weekday],
+                "absences": plotdata.combined.to_numpy(),
+                "pct": plotdata.pctAbsent.to_numpy().round(4),
+            }
+        )
+    )
+
+    def calendar(field, title, fmt):
+        return {
+            "title": title,
+            "mark": {"type": "rect", "tooltip": True},
+            "encoding": {
+                "x": {
+                    "field": "weekday",
+                    "type": "ordinal",
+                    "sort": ["M", "T", "W", "R", "F"],
+                    "title": None,
+                    "axis": {"orient": "top", "labelAngle": 0},
+                },
+                "y": {
+                    "field": "week_of",
+                    "type": "ordinal",
+                    "sort": {"field": "week"},
+                    "title": "Week of",
+                },
+                "color": {
+                    "field": field,
+                    "type": "quantitative",
+                    "scale": {"scheme": "viridis"},
+                    "legend": {"format": fmt, "title": None},
+                },
+                "tooltip": [
+                    {"field": "date", "title": " "},
+                    {"field": field, "format": fmt, "title": " "},
+                ],
+            },
+            "height": {"step": 18},
+        }
+
+    return {
+        "data": {"values": days},
+        "resolve": independent,
+        "hconcat": [
+            calendar("absences", "Total Absences Per Day", ",d"),
+            calendar("pct", "% Absent Per Day", ".0%"),
+        ],
+    }
+
+
+# chart_plotting function -> the spec builder that draws the same chart
+spec_builders = {
+    cp.grade_race_gender_charts: attendance_spec,
+    cp.gender_charts: gender_spec,
+    cp.race_gender_charts: race_gender_spec,
+    cp.sp_eng_fre_charts: sp_eng_fre_spec,
+    cp.grade_3yr_charts: grade_3yr_spec,
+    cp.race_grade_charts: race_grade_spec,
+    cp.absence_gender_charts: absence_gender_spec,
+    cp.absence_grade_charts: absence_grade_spec,
+    cp.notification_plot: notification_spec,
+    cp.notification_plot2: notification_spec2,
+    cp.notification_plot3: notification_spec3,
+    cp.notif_grade_plot: notif_grade_spec,
+    cp.notif_grade_plot2: notif_grade_spec2,
+    cp.notif_grade_plot3: notif_grade_spec3,
+    cp.school_bar_charts: school_spec,
+    cp.heatmap_plot: heatmap_spec,
+}
+
+
+def chart_spec(report, plotdata, page=0):
+    """Vega-Lite spec (as a json string) for a page of the report's chart, or
+    None."""
+    if plotdata is None or not len(plotdata) or report not in cp.renderers:
+        return None
+    renderer, _, kwargs = cp.renderers[report]
+    if cp.page_count(report, plotdata) > 1:
+        kwargs = {**kwargs, "page": page}
+    spec = spec_builders[renderer](plotdata, **kwargs)
+    spec["$schema"] = SCHEMA
+    # NaN would be written as a bare NaN, which JSON.parse rejects
+    return json.dumps(spec, default=str, allow_nan=False)
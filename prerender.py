@@ -0,0 +1,123 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Renders every chart (light and dark) and styled table for every month,
+# district and report ahead of time, so the app can serve them from disk:
+#
+#   python prerender.py --out prerendered --workers 4
+#
+# Artifacts are stored under the version of the snapshot they were built from,
+# so a month that changes in the datastore is simply rendered live again until
+# this is re-run.
+
+path_to_file = os.path.dirname(__file__)
+
+
+def artifact_path(root, version, district, report, name):
+    return os.path.join(root, version, district, report, name)
+
+
+def chart_filename(page=0, dark=False):
+    # chart.png, chart-dark.png, chart-p2.png, chart-p2-dark.png, ...
+    name = "chart"
+    if page:
+        name += f"-p{page + 1}"
+    if dark:
+        name += "-dark"
+    return name + ".png"
+
+
+def _open_store():
+    from datastore import DataStore, datastore_from_env, month_registry, open_datastore
+
+    source, cache = datastore_from_env(os.path.join(path_to_file, ".datastore_cache"))
+    offline = os.getenv("DATASTORE_OFFLINE") == "1"
+    return DataStore(month_registry(open_datastore(source, cache, offline=offline)))
+
+
+_store = None
+
+
+def _init_worker():
+    global _store
+    import matplotlib
+
+    matplotlib.use("Agg")
+    # the parent process has already revalidated and downloaded everything
+    os.environ["DATASTORE_OFFLINE"] = "1"
+    _store = _open_store()
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def render_district(out_dir, month, district, width, height, pixelratio):
+    from chart_plotting import page_count, render_png, renderers
+    from utils import reports, table_html
+
+    version = _store.version_of(month)
+    for report in reports.values():
+        plotdata = _store.get(month, district, report)
+        if plotdata is None:
+            # the district has no data for this report
+            continue
+        if report in renderers:
+            for page in range(page_count(report, plotdata)):
+                for dark in [False, True]:
+                    png = render_png(
+                        report, plotdata, width, height, pixelratio, dark, page
+                    )
+                    name = chart_filename(page, dark)
+                    _write(artifact_path(out_dir, version, district, report, name), png)
+        html = table_html(report, plotdata)
+        _write(
+            artifact_path(out_dir, version, district, report, "table.html"),
+            html.encode(),
+        )
+    return month, district
+
+
+def main():
+    from utils import districts
+
+    parser = argparse.ArgumentParser(
+        description="Pre-render every chart and table for the app."
+    )
+    parser.add_argument("--out", default=os.path.join(path_to_file, "prerendered"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--width", type=int, default=1000, help="css pixels")
+    parser.add_argument("--height", type=int, default=650, help="css pixels")
+    parser.add_argument("--pixelratio", type=float, default=2)
+    args = parser.parse_args()
+
+    store = _open_store()
+    for snapshot in store.snapshots().values():
+        snapshot.prefetch()
+
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(
+                render_district,
+                args.out,
+                month,
+                district,
+                args.width,
+                args.height,
+                args.pixelratio,
+            )
+            for month in store.months()
+            for district in districts.values()
+        ]
+        for future in as_completed(futures):
+            month, district = future.result()
+            print(f"rendered {month} / {district}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+import argparse
+import json
+import os
+import pickle
+
+import pandas as pd
+
+from daily import DAILY, to_daily
+from facts import (
+    FACTS,
+    aggregations,
+    category_orders,
+    count_columns,
+    key_columns,
+    keyed,
+    to_facts,
+)
+
+# A columnar snapshot is a directory holding one parquet file per
+# (district, report) frame plus a manifest.json listing them:
+#
+#   data/october/manifest.json
+#   data/october/camino_unified__bygrade.parquet
+#   ...
+#
+# so a single frame can be read without touching the rest of the month.
+# Reports that are None for a district are recorded as null in the manifest.
+#
+# The manifest also carries the snapshot's metadata, which is all the app needs
+# to list a month without loading it:
+#
+#   "metadata": {"label": "October", "period_start": "2024-08-01",
+#                "period_end": "2024-10-04", "school_year": "2024-25"}
+#
+# Legacy pickle snapshots can carry the same dict in a json sidecar next to
+# the pickle (october.pickle -> october.json).
+#
+# A snapshot can also hold its student records as a fact table
+# ("facts": "facts.parquet" in the manifest, see facts.py). The reports that
+# are aggregated from it are then left out of the partitions. It can carry
+# its students' days as well ("daily": "daily.parquet", see daily.py), so
+# reports can be worked out for any dates within the month.
+#
+# A delta snapshot holds only what changed since an earlier snapshot, its
+# base, named in the manifest ("base": "2024_09"):
+#
+# - its fact table has just the students whose rows are new or changed;
+#   they replace the base's rows for the same student and school
+# - likewise its daily records are just the new or changed days, replacing
+#   the base's for the same student, school and date
+# - the reports in appended_reports (one row per day) hold just the new or
+#   changed days, which are added to the base's frame
+# - other frames are there only if they changed; the rest are the base's
+#
+# The base can be a delta too, so a month is rebuilt from a full snapshot
+# and the chain of deltas after it.
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+DELTA_FORMAT_VERSION = 2
+
+# reports that gain a row for each school day
+appended_reports = ["heatmap"]
+
+
+def partition_filename(district, report):
+    return f"{district}__{report}.parquet"
+
+
+def export_snapshot(month_data, out_dir, metadata=None, facts=None, daily=None):
+    """Write a month dict (district -> report -> DataFrame) as a columnar snapshot.
+
+    With facts (a frame of student records), they are written as the fact
+    table and the reports that can be aggregated from it aren't written.
+    daily (a frame of daily records) goes with facts.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    partitions = {}
+    for district, district_reports in month_data.items():
+        partitions[district] = {}
+        for report, df in district_reports.items():
+            if facts is not None and report in aggregations:
+                continue
+            if df is None:
+                partitions[district][report] = None
+                continue
+            filename = partition_filename(district, report)
+            df.to_parquet(os.path.join(out_dir, filename))
+            partitions[district][report] = filename
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "metadata": metadata or {},
+        "partitions": partitions,
+    }
+    if facts is not None:
+        to_facts(facts).to_parquet(os.path.join(out_dir, FACTS))
+        manifest["facts"] = FACTS
+    if daily is not None:
+        to_daily(daily).to_parquet(os.path.join(out_dir, DAILY))
+        manifest["daily"] = DAILY
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def changed_rows(frame, previous):
+    # the rows of frame that previous doesn't have, or has with other values.
+    # both need a unique index
+    new = ~frame.index.isin(previous.index)
+    kept = frame[~new]
+    differs = (
+        kept.astype(str).to_numpy()
+        != previous.loc[kept.index, frame.columns].astype(str).to_numpy()
+    ).any(axis=1)
+    return frame[new | frame.index.isin(kept.index[differs])]
+
+
+def export_delta(
+    month_data,
+    out_dir,
+    base,
+    base_data,
+    metadata=None,
+    facts=None,
+    base_facts=None,
+    daily=None,
+    base_daily=None,
+):
+    """Write what changed in month_data (and facts and daily) since base_data
+    (and base_facts and base_daily) as a delta snapshot of the snapshot named
+    base."""
+    os.makedirs(out_dir, exist_ok=True)
+    partitions = {}
+    appended = set()
+    for district, district_reports in month_data.items():
+        partitions[district] = {}
+        for report, df in district_reports.items():
+            if facts is not None and report in aggregations:
+                continue
+            previous = base_data.get(district, {}).get(report)
+            if df is None:
+                if previous is not None:
+                    partitions[district][report] = None
+                continue
+            if report in appended_reports:
+                if previous is not None:
+                    df = changed_rows(df, previous)
+                if not len(df):
+                    continue
+                appended.add(report)
+            elif previous is not None and df.equals(previous):
+                continue
+            filename = partition_filename(district, report)
+            df.to_parquet(os.path.join(out_dir, filename))
+            partitions[district][report] = filename
+
+    manifest = {
+        "format": DELTA_FORMAT_VERSION,
+        "metadata": metadata or {},
+        "base": base,
+        "partitions": partitions,
+        "appended": sorted(appended),
+    }
+    if facts is not None:
+        rows = facts
+        if base_facts is not None:
+            columns = ["student_id", *category_orders, *count_columns]
+            rows = changed_rows(keyed(facts)[columns], keyed(base_facts)[columns])
+        if len(rows):
+            to_facts(rows.reset_index(drop=True)).to_parquet(
+                os.path.join(out_dir, FACTS)
+            )
+            manifest["facts"] = FACTS
+    if daily is not None:
+        rows = to_daily(daily)
+        if base_daily is not None:
+            columns = [*key_columns, "date"]
+            rows = changed_rows(
+                keyed(rows, columns), keyed(to_daily(base_daily), columns)
+            )
+        if len(rows):
+            to_daily(rows.reset_index(drop=True)).to_parquet(
+                os.path.join(out_dir, DAILY)
+            )
+            manifest["daily"] = DAILY
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def merge_facts(base, delta):
+    # the delta's rows replace the base's for the same student and school
+    replaced = keyed(base).index.isin(keyed(delta).index)
+    return to_facts(pd.concat([base[~replaced], delta], ignore_index=True))
+
+
+def merge_daily(base, delta):
+    # the delta's days replace the base's for the same student, school and date
+    columns = [*key_columns, "date"]
+    replaced = keyed(base, columns).index.isin(keyed(delta, columns).index)
+    return to_daily(pd.concat([base[~replaced], delta], ignore_index=True))
+
+
+def merge_rows(base, rows):
+    # rows added to (or replacing those with the same index in) base
+    if base is None:
+        return rows
+    merged = pd.concat([base[~base.index.isin(rows.index)], rows])
+    return merged.sort_index()
+
+
+def read_facts(path):
+    # student (or daily) records from a parquet or csv file; labels are read as text so
+    # zip codes keep their leading zeros
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype={column: str for column in category_orders})
+
+
+def read_manifest(source):
+    manifest = json.load(source)
+    if manifest.get("format") not in (FORMAT_VERSION, DELTA_FORMAT_VERSION):
+        raise ValueError(f"unsupported snapshot format: {manifest.get('format')}")
+    return manifest
+
+
+def read_metadata(source):
+    return json.load(source)
+
+
+def read_partition(source):
+    # source is a local path (memory-mapped) or a binary file object
+    if isinstance(source, str):
+        return pd.read_parquet(source, memory_map=True)
+    return pd.read_parquet(source)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a monthly snapshot pickle into a columnar snapshot directory."
+    )
+    parser.add_argument("pickle_file")
+    parser.add_argument("out_dir")
+    parser.add_argument("--label", help='month name shown in the app, e.g. "October"')
+    parser.add_argument("--period-start", help="first day covered, YYYY-MM-DD")
+    parser.add_argument("--period-end", help="last day covered, YYYY-MM-DD")
+    parser.add_argument("--school-year", help='e.g. "2024-25"')
+    parser.add_argument(
+        "--facts",
+        help="csv or parquet of student records (see facts.py) to store in place "
+        "of the reports that can be aggregated from them",
+    )
+    parser.add_argument(
+        "--daily",
+        help="csv or parquet of daily records (see daily.py) to go with --facts, "
+        "so reports can be made for any dates",
+    )
+    parser.add_argument(
+        "--base",
+        help="write a delta of the snapshot with this name, holding only what "
+        "changed since --base-pickle (and --base-facts)",
+    )
+    parser.add_argument("--base-pickle", help="the base snapshot's pickle")
+    parser.add_argument("--base-facts", help="the base snapshot's student records")
+    parser.add_argument("--base-daily", help="the base snapshot's daily records")
+    args = parser.parse_args()
+    metadata = {
+        key: value
+        for key, value in [
+            ("label", args.label),
+            ("period_start", args.period_start),
+            ("period_end", args.period_end),
+            ("school_year", args.school_year),
+        ]
+        if value is not None
+    }
+
+    # only run this on pickles we produced ourselves
+    with open(args.pickle_file, "rb") as f:
+        month_data = pickle.load(f)
+    facts = read_facts(args.facts) if args.facts else None
+    if args.daily and facts is None:
+        parser.error("--daily needs --facts")
+    daily = read_facts(args.daily) if args.daily else None
+    if args.base:
+        if not args.base_pickle:
+            parser.error("--base needs --base-pickle")
+        with open(args.base_pickle, "rb") as f:
+            base_data = pickle.load(f)
+        base_facts = read_facts(args.base_facts) if args.base_facts else None
+        base_daily = read_facts(args.base_daily) if args.base_daily else None
+        manifest = export_delta(
+            month_data,
+            args.out_dir,
+            args.base,
+            base_data,
+            metadata,
+            facts,
+            base_facts,
+            daily,
+            base_daily,
+        )
+    else:
+        manifest = export_snapshot(month_data, args.out_dir, metadata, facts, daily)
+    n_frames = sum(
+        f is not None for d in manifest["partitions"].values() for f in d.values()
+    )
+    print(f"wrote {n_frames} frames to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
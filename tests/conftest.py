@@ -0,0 +1,75 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the app's modules live at the top of the repo, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facts import count_columns, key_columns  # noqa: E402
+
+DISTRICTS = ["camino_unified", "latrobe"]
+
+
+def make_students(n, seed=0, first_id=0):
+    rng = np.random.default_rng(seed)
+    district = rng.choice(DISTRICTS, n)
+    return pd.DataFrame(
+        {
+            "student_id": [str(first_id + i) for i in range(n)],
+            "district": district,
+            "school": [
+                f"{d} school {k}" for d, k in zip(district, rng.integers(0, 3, n))
+            ],
+            "grade": rng.choice(["K", "1", "2", "9"], n),
+            "race": rng.choice(["Asian", "Hispanic", "White"], n),
+            "gender": rng.choice(["M", "F"], n),
+            "iep": rng.choice(["Yes", "No"], n),
+            "english_learner": rng.choice(["Yes", "No"], n),
+            "free_reduced_lunch": rng.choice(["Yes", "No"], n),
+            "zip_code": rng.choice(["95667", "95709"], n),
+        }
+    )
+
+
+def make_daily(students, dates, seed=0, quiet_days=()):
+    # every student enrolled on every date; nobody misses a quiet day
+    rng = np.random.default_rng(seed)
+    dates = pd.DatetimeIndex(dates)
+    n = len(students) * len(dates)
+    daily = pd.DataFrame(
+        {
+            "student_id": np.repeat(students.student_id.to_numpy(), len(dates)),
+            "school": np.repeat(students.school.to_numpy(), len(dates)),
+            "date": np.tile(dates, len(students)),
+            "days_enrolled": 1,
+        }
+    )
+    absent = rng.random(n) < 0.15
+    absent &= ~daily.date.isin(pd.DatetimeIndex(quiet_days))
+    excused = rng.random(n) < 0.5
+    daily["days_excused"] = (absent & excused).astype(int)
+    daily["days_unexcused"] = (absent & ~excused).astype(int)
+    daily["days_suspended"] = 0
+    daily["suspensions"] = 0
+    daily["absence_letters"] = (absent & (rng.random(n) < 0.1)).astype(int)
+    daily["truancy_notices"] = (absent & (rng.random(n) < 0.1)).astype(int)
+    return daily
+
+
+def facts_from(students, daily):
+    # student records whose counts are their days' totals
+    totals = daily.groupby(key_columns)[count_columns].sum().reset_index()
+    return students.merge(totals, on=key_columns)
+
+
+@pytest.fixture
+def students():
+    return make_students(60)
+
+
+@pytest.fixture
+def school_days():
+    return pd.bdate_range("2024-09-03", "2024-09-30")
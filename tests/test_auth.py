@@ -0,0 +1,118 @@
+import bcrypt
+import pytest
+
+from auth import LoginLimiter, UserRegistry
+
+LIMITS = {"session": (1 / 5, 5), "ip": (2, 30), "user": (1 / 10, 10)}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return LoginLimiter(
+        LIMITS, free_failures=3, base_delay=2, max_delay=300, clock=clock
+    )
+
+
+def fail(limiter, ip, username="BOM"):
+    assert limiter.attempt([("ip", ip)], (ip, username)) == 0
+    limiter.failed((ip, username), [("user", username)])
+
+
+def test_session_bucket_empties_and_refills(limiter, clock):
+    clients = [("session", "s1")]
+    for _ in range(5):
+        assert limiter.attempt(clients, ("1.1.1.1", "BOM")) == 0
+    assert limiter.attempt(clients, ("1.1.1.1", "BOM")) == pytest.approx(5)
+    clock.now += 5
+    assert limiter.attempt(clients, ("1.1.1.1", "BOM")) == 0
+    # another session has a bucket of its own
+    assert limiter.attempt([("session", "s2")], ("1.1.1.1", "BOM")) == 0
+
+
+def test_lockout_doubles_after_the_free_failures(limiter, clock):
+    account = ("1.1.1.1", "BOM")
+    for _ in range(3):
+        fail(limiter, "1.1.1.1")
+    assert limiter.attempt([], account) == 0
+    limiter.failed(account)
+    assert limiter.attempt([], account) == pytest.approx(2)
+    clock.now += 2
+    limiter.failed(account)
+    assert limiter.attempt([], account) == pytest.approx(4)
+    clock.now += 4
+    limiter.failed(account)
+    assert limiter.attempt([], account) == pytest.approx(8)
+
+
+def test_lockout_is_capped_at_max_delay(limiter, clock):
+    account = ("1.1.1.1", "BOM")
+    for _ in range(20):
+        limiter.failed(account)
+    assert limiter.attempt([], account) == pytest.approx(300)
+
+
+def test_lockout_is_per_address(limiter):
+    for _ in range(5):
+        limiter.failed(("1.1.1.1", "BOM"))
+    assert limiter.attempt([], ("1.1.1.1", "BOM")) > 0
+    assert limiter.attempt([], ("2.2.2.2", "BOM")) == 0
+    assert limiter.attempt([], ("1.1.1.1", "CAMINO")) == 0
+
+
+def test_success_resets_the_address(limiter):
+    account = ("1.1.1.1", "BOM")
+    for _ in range(5):
+        limiter.failed(account)
+    limiter.succeeded(account)
+    assert limiter.attempt([], account) == 0
+    # and counting starts over
+    limiter.failed(account)
+    assert limiter.attempt([], account) == 0
+
+
+def test_strangers_cannot_lock_out_the_right_key(limiter, clock):
+    # one address keeps guessing COUNTY's key while others log in
+    for i in range(60):
+        clock.now += 10
+        if limiter.attempt([("ip", "6.6.6.6")], ("6.6.6.6", "COUNTY")) == 0:
+            limiter.failed(("6.6.6.6", "COUNTY"), [("user", "COUNTY")])
+        ip = f"10.0.0.{i}"
+        assert limiter.attempt([("ip", ip)], (ip, "COUNTY")) == 0
+        limiter.succeeded((ip, "COUNTY"))
+
+
+def test_wrong_keys_past_the_username_limit_lock_at_once(limiter):
+    # ten addresses use up the username's wrong keys...
+    for i in range(10):
+        fail(limiter, f"10.0.0.{i}")
+    assert limiter.attempt([], ("10.0.0.0", "BOM")) == 0
+    # ...so a fresh address's first wrong key locks it for max_delay
+    fail(limiter, "10.0.1.1")
+    assert limiter.attempt([], ("10.0.1.1", "BOM")) == pytest.approx(300)
+    assert limiter.attempt([], ("10.0.1.2", "BOM")) == 0
+
+
+def test_registry_checks_keys():
+    key_hash = bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=4))
+    users = UserRegistry(
+        {"LATROBE": (key_hash, ["Latrobe"]), "COUNTY": (key_hash, "*")}
+    )
+    assert users.check("LATROBE", "secret") == ["Latrobe"]
+    assert users.check("LATROBE", "wrong") is None
+    assert users.check("NOBODY", "secret") is None
+    assert "El Dorado County" in users.check("COUNTY", "secret")
+    with pytest.raises(ValueError):
+        UserRegistry({"X": (key_hash, ["Nowhere Unified"])})
@@ -0,0 +1,56 @@
+from caching import LRUCache
+
+
+def test_evicts_least_recently_used_past_max_bytes():
+    cache = LRUCache(10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # b is now the oldest
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    assert cache.nbytes == 8
+
+
+def test_replacing_a_key_counts_its_size_once():
+    cache = LRUCache(10)
+    cache.put("a", b"aaaa")
+    cache.put("a", b"aaaaaa")
+    assert len(cache) == 1
+    assert cache.nbytes == 6
+
+
+def test_values_bigger_than_the_cache_are_returned_but_not_kept():
+    cache = LRUCache(4)
+    assert cache.put("a", b"aaaaa") == b"aaaaa"
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_get_or_compute_does_not_cache_none():
+    cache = LRUCache(10)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_compute("a", compute) is None
+    assert cache.get_or_compute("a", compute) is None
+    assert len(calls) == 2
+    assert cache.get_or_compute("b", lambda: b"bb") == b"bb"
+    assert cache.get_or_compute("b", lambda: b"other") == b"bb"
+
+
+def test_discard_drops_matching_keys_and_their_bytes():
+    cache = LRUCache(100, sizeof=lambda value: value)
+    cache.put(("v1", "x"), 10)
+    cache.put(("v1", "y"), 20)
+    cache.put(("v2", "x"), 30)
+    cache.discard(lambda key: key[0] == "v1")
+    assert len(cache) == 1
+    assert cache.nbytes == 30
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
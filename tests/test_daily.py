@@ -0,0 +1,60 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from chart_plotting import render_png, renderers
+from conftest import DISTRICTS, facts_from, make_daily
+from daily import DailyCounts, to_daily
+from facts import COUNTY, aggregate, aggregations, to_facts
+
+
+def daily_counts(students, days, **kwargs):
+    daily = make_daily(students, days, seed=1, **kwargs)
+    facts = to_facts(facts_from(students, daily))
+    return facts, DailyCounts(facts, to_daily(daily))
+
+
+@pytest.mark.parametrize("district", [COUNTY, DISTRICTS[0]])
+def test_full_span_report_equals_the_stored_aggregate(students, school_days, district):
+    facts, counts = daily_counts(students, school_days)
+    start, end = counts.span()
+    assert (start, end) == (school_days[0].date(), school_days[-1].date())
+    for report in aggregations:
+        expected = aggregate(facts, district, report)
+        got = counts.report(district, report, start, end)
+        pd.testing.assert_frame_equal(got, expected, obj=report)
+
+
+def test_window_counts_are_the_days_in_it(students, school_days):
+    facts, counts = daily_counts(students, school_days)
+    week = school_days[5:10]
+    window = counts.window_facts(week[0].date(), week[-1].date())
+    assert (window.days_enrolled == len(week)).all()
+    heatmap = counts.report(COUNTY, "heatmap", week[0].date(), week[-1].date())
+    assert list(heatmap.index) == list(week)
+
+
+def test_single_day_without_absences(students, school_days):
+    quiet = school_days[3]
+    facts, counts = daily_counts(students, school_days, quiet_days=[quiet])
+    day = quiet.date()
+    window = counts.window_facts(day, day)
+    assert len(window) == len(facts)
+    assert (window.days_excused + window.days_unexcused == 0).all()
+    heatmap = counts.report(COUNTY, "heatmap", day, day)
+    assert heatmap.combined.tolist() == [0]
+    assert heatmap.pctAbsent.tolist() == [0]
+    # every chart of the day draws, pies with no one in a slice included
+    for report in [*aggregations, "heatmap"]:
+        plotdata = counts.report(DISTRICTS[0], report, day, day)
+        assert plotdata is not None, report
+        if report in renderers:
+            assert render_png(report, plotdata, 800, 400).startswith(b"\x89PNG")
+
+
+def test_window_without_school_days_has_no_reports(students, school_days):
+    _, counts = daily_counts(students, school_days)
+    saturday = datetime.date(2024, 9, 7)
+    for report in ["bygrade", "heatmap"]:
+        assert counts.report(COUNTY, report, saturday, saturday) is None
@@ -0,0 +1,137 @@
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import DISTRICTS, facts_from, make_daily, make_students
+from datastore import DiskCache, LocalSource, open_datastore
+from facts import COUNTY, aggregations, key_columns
+from snapshot import export_delta, export_snapshot, read_partition
+
+
+def heatmap_frame(daily):
+    days = daily.groupby("date")[["days_excused", "days_unexcused", "days_enrolled"]]
+    days = days.sum()
+    combined = days.days_excused + days.days_unexcused
+    return pd.DataFrame(
+        {"combined": combined, "pctAbsent": combined / days.days_enrolled}
+    )
+
+
+def month_data(students, daily, prior, dropped=()):
+    # the frames that aren't aggregated from facts, for each district
+    data = {}
+    for district in [*DISTRICTS, COUNTY]:
+        mine = daily
+        if district != COUNTY:
+            ids = students.student_id[students.district == district]
+            mine = daily[daily.student_id.isin(ids)]
+        data[district] = {
+            "heatmap": heatmap_frame(mine),
+            "bygrade_prior": pd.DataFrame({"Total": [0.1, 0.2]}, index=["K", "1"]),
+            "bygrade3yrs": pd.DataFrame({"Total": [prior, 0.3]}, index=["K", "1"]),
+            "bygrade_two_yr_prior": (
+                None
+                if district in dropped
+                else pd.DataFrame({"Total": [0.4]}, index=["K"])
+            ),
+        }
+    return data
+
+
+@pytest.fixture
+def months(tmp_path, students, school_days):
+    # september in full; october as a full export and as a delta on september
+    daily1 = make_daily(students, school_days, seed=1)
+    october = pd.bdate_range("2024-10-01", "2024-10-15")
+    newcomers = make_students(10, seed=2, first_id=len(students))
+    daily2 = pd.concat(
+        [
+            daily1,
+            make_daily(students, october, seed=2),
+            make_daily(newcomers, october, seed=3),
+        ],
+        ignore_index=True,
+    )
+    # a correction to a september day and to a student's grade
+    daily2.loc[0, ["days_excused", "days_unexcused"]] = [1, 0]
+    students2 = pd.concat([students, newcomers], ignore_index=True)
+    students2.loc[1, "grade"] = "2"
+    facts1 = facts_from(students, daily1)
+    facts2 = facts_from(students2, daily2)
+    data1 = month_data(students, daily1, 0.5)
+    data2 = month_data(students2, daily2, 0.6, dropped=["latrobe"])
+
+    root = tmp_path / "data"
+    export_snapshot(data1, root / "2024_09", {"label": "September"}, facts1, daily1)
+    export_snapshot(data2, root / "2024_10_full", {"label": "Full"}, facts2, daily2)
+    manifest = export_delta(
+        data2,
+        root / "2024_10",
+        "2024_09",
+        data1,
+        {"label": "October"},
+        facts2,
+        facts1,
+        daily2,
+        daily1,
+    )
+    snapshots = open_datastore(LocalSource(str(root)), DiskCache(str(tmp_path / "c")))
+    return snapshots, manifest, root
+
+
+def sorted_rows(frame, columns):
+    frame = frame.astype({c: str for c in frame.select_dtypes("category")})
+    return frame.sort_values(columns, ignore_index=True)
+
+
+def test_delta_holds_only_what_changed(months):
+    _, manifest, root = months
+    assert manifest["base"] == "2024_09"
+    assert manifest["appended"] == ["heatmap"]
+    delta = manifest["partitions"]
+    assert "bygrade_prior" not in delta["latrobe"]
+    assert delta["latrobe"]["bygrade_two_yr_prior"] is None
+    assert "bygrade3yrs" in delta["latrobe"]
+    # the corrected day, october and the newcomers
+    heatmap = read_partition(str(root / "2024_10" / delta[COUNTY]["heatmap"]))
+    assert len(heatmap) == 1 + len(pd.bdate_range("2024-10-01", "2024-10-15"))
+    full_daily = read_partition(str(root / "2024_10_full" / "daily.parquet"))
+    delta_daily = read_partition(str(root / "2024_10" / "daily.parquet"))
+    assert 0 < len(delta_daily) < len(full_daily)
+
+
+def test_delta_rebuilt_month_equals_the_full_export(months):
+    snapshots, _, _ = months
+    full, delta = snapshots["2024_10_full"], snapshots["2024_10"]
+    assert delta.base() is snapshots["2024_09"]
+    assert delta.version != full.version
+
+    pd.testing.assert_frame_equal(
+        sorted_rows(delta.facts(), key_columns),
+        sorted_rows(full.facts(), key_columns),
+    )
+    # parquet keeps the dates in milliseconds; a merge leaves them in seconds
+    pd.testing.assert_frame_equal(
+        sorted_rows(delta.daily_rows(), [*key_columns, "date"]),
+        sorted_rows(full.daily_rows(), [*key_columns, "date"]),
+        check_dtype=False,
+    )
+    assert delta.date_span() == full.date_span()
+
+    reports = ["heatmap", "bygrade_prior", "bygrade3yrs", "bygrade_two_yr_prior"]
+    for district in [*DISTRICTS, COUNTY]:
+        for report in [*reports, *aggregations]:
+            expected = full.load_partition(district, report)
+            got = delta.load_partition(district, report)
+            if expected is None:
+                assert got is None, (district, report)
+            else:
+                pd.testing.assert_frame_equal(got, expected, obj=(district, report))
+
+
+def test_delta_without_its_base_is_left_out(tmp_path, months):
+    _, _, root = months
+    os.rename(root / "2024_09", tmp_path / "elsewhere")
+    snapshots = open_datastore(LocalSource(str(root)), DiskCache(str(tmp_path / "d")))
+    assert sorted(snapshots) == ["2024_10_full"]
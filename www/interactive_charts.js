@@ -0,0 +1,68 @@
+// Draws the Vega-Lite specs the server sends for the interactive chart mode
+// (see interactive_charts.py). The last spec is kept, so resizing the window,
+// switching between light and dark mode or coming back to the Graphs tab
+// redraws the chart here without asking the server for anything.
+(function () {
+  let last = null;
+  let view = null;
+
+  function isDark() {
+    return document.documentElement.getAttribute("data-bs-theme") === "dark";
+  }
+
+  function fitWidth(spec, width) {
+    // side by side charts share the width; charts stacked one above the
+    // other, or a single chart, take all of it
+    const charts = spec.hconcat || spec.vconcat || [spec];
+    const across = spec.hconcat ? charts.length : 1;
+    const each = Math.max(200, width / across - 100);
+    for (const chart of charts) {
+      chart.width = each;
+    }
+    return spec;
+  }
+
+  function draw() {
+    if (!last) {
+      return;
+    }
+    const el = document.getElementById(last.id);
+    if (!el || !el.offsetWidth) {
+      // in a hidden tab; it's drawn when the tab is shown
+      return;
+    }
+    if (view) {
+      view.finalize();
+      view = null;
+    }
+    if (!last.spec) {
+      el.replaceChildren();
+      return;
+    }
+    const spec = fitWidth(JSON.parse(last.spec), el.clientWidth);
+    vegaEmbed(el, spec, {
+      theme: isDark() ? "dark" : undefined,
+      actions: { export: true, source: false, compiled: false, editor: false },
+    }).then((result) => {
+      view = result.view;
+    });
+  }
+
+  document.addEventListener("DOMContentLoaded", () => {
+    Shiny.addCustomMessageHandler("interactive-chart", (message) => {
+      last = message;
+      draw();
+    });
+  });
+
+  new MutationObserver(draw).observe(document.documentElement, {
+    attributes: true,
+    attributeFilter: ["data-bs-theme"],
+  });
+  let resizeTimer = null;
+  window.addEventListener("resize", () => {
+    clearTimeout(resizeTimer);
+    resizeTimer = setTimeout(draw, 200);
+  });
+  document.addEventListener("shown.bs.tab", draw);
+})();